@@ -47,6 +47,26 @@ def get_config():
     return config_class()
 
 
+def reload_from_env(env=None):
+    """
+    Re-select the active config for FIGURINE_ENV in place.
+
+    Only the environment lookup reruns - the class definitions and
+    submodule imports stay cached, unlike a full importlib.reload.
+
+    Args:
+        env: Optional FIGURINE_ENV value to switch to first
+
+    Returns:
+        The newly selected configuration instance
+    """
+    global config
+    if env is not None:
+        os.environ['FIGURINE_ENV'] = env
+    config = get_config()
+    return config
+
+
 # Global configuration instance
 config = get_config()
 
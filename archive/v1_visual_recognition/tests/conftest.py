@@ -0,0 +1,49 @@
+"""
+Shared pytest setup: make the project root importable once per session
+and memoize per-environment config loads.
+"""
+import compileall
+import os
+import sys
+from functools import lru_cache
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import config as _config_mod
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_config_cache():
+    """Pre-compile the config package so later loads hit cached bytecode.
+
+    CI caches the __pycache__ directory between runs; warming it here
+    means a cold checkout only pays the parse/compile cost once.
+    """
+    compileall.compile_dir(
+        os.path.dirname(_config_mod.__file__), quiet=1)
+
+
+@lru_cache(maxsize=None)
+def load_config(env):
+    """Load and memoize the config singleton for one environment."""
+    # reload_from_env reruns only the env lookup; class definitions and
+    # submodule imports stay cached
+    return _config_mod.reload_from_env(env)
+
+
+@pytest.fixture(scope="session", params=("dev", "pi"))
+def loaded_config(request):
+    """Yield (env, config) once per environment for the whole session."""
+    original_env = os.environ.get('FIGURINE_ENV')
+
+    def _restore():
+        load_config.cache_clear()
+        if original_env is None:
+            os.environ.pop('FIGURINE_ENV', None)
+        else:
+            os.environ['FIGURINE_ENV'] = original_env
+
+    request.addfinalizer(_restore)
+    return request.param, load_config(request.param)
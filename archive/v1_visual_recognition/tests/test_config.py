@@ -2,56 +2,44 @@
 Tests for configuration loading
 """
 import pytest
-import os
-import sys
-
-# Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-
-class TestConfig:
-    """Test configuration loading and environment switching"""
-    
-    def test_dev_config_loads(self):
-        """Test that dev config loads with correct settings"""
-        os.environ['FIGURINE_ENV'] = 'dev'
-        
-        # Force reload of config module
-        if 'config' in sys.modules:
-            del sys.modules['config']
-        
-        from config import config
-        
-        assert config.DEBUG is True
-        assert config.CAMERA_WIDTH == 1280
-        assert config.SHOW_DEBUG_WINDOW is True
-    
-    def test_pi_config_loads(self):
-        """Test that pi config loads with correct settings"""
-        os.environ['FIGURINE_ENV'] = 'pi'
-        
-        # Force reload
-        if 'config' in sys.modules:
-            del sys.modules['config']
-        
-        from config import config
-        
-        assert config.DEBUG is False
-        assert config.CAMERA_WIDTH == 640
-        assert config.SHOW_DEBUG_WINDOW is False
-    
-    def test_config_has_required_attributes(self):
-        """Test that config has all required attributes"""
-        from config import config
-        
-        required_attrs = [
-            'CAMERA_WIDTH', 'CAMERA_HEIGHT', 'CAMERA_FPS',
-            'MIN_CONTOUR_AREA', 'MAX_SHAPES',
-            'CONFIDENCE_THRESHOLD', 'INFERENCE_THREADS'
-        ]
-        
-        for attr in required_attrs:
-            assert hasattr(config, attr), f"Config missing attribute: {attr}"
+
+# The loaded_config fixture and its memoized load_config helper live in
+# conftest.py
+
+
+# Expected environment-specific settings, keyed by FIGURINE_ENV
+EXPECTED_SETTINGS = {
+    'dev': {'DEBUG': True, 'CAMERA_WIDTH': 1280, 'SHOW_DEBUG_WINDOW': True},
+    'pi': {'DEBUG': False, 'CAMERA_WIDTH': 640, 'SHOW_DEBUG_WINDOW': False},
+}
+
+
+def test_env_config_loads(loaded_config):
+    """Test that each environment loads with its correct settings"""
+    env, config = loaded_config
+    expected = EXPECTED_SETTINGS[env]
+
+    assert config.DEBUG is expected['DEBUG']
+    assert config.CAMERA_WIDTH == expected['CAMERA_WIDTH']
+    assert config.SHOW_DEBUG_WINDOW is expected['SHOW_DEBUG_WINDOW']
+
+
+# Attributes every environment's config must define
+REQUIRED_ATTRS = (
+    'CAMERA_WIDTH', 'CAMERA_HEIGHT', 'CAMERA_FPS',
+    'MIN_CONTOUR_AREA', 'MAX_SHAPES',
+    'CONFIDENCE_THRESHOLD', 'INFERENCE_THREADS'
+)
+
+
+def test_config_has_required_attributes(loaded_config):
+    """Test that config has all required attributes"""
+    _, config = loaded_config
+
+    # dir() covers class-level attributes; one set difference replaces
+    # seven hasattr round-trips and reports every missing name at once
+    missing = set(REQUIRED_ATTRS).difference(dir(config))
+    assert not missing, f"Config missing attributes: {sorted(missing)}"
 
 
 if __name__ == "__main__":
@@ -6,42 +6,92 @@ Respects level-specific shape constraints (level 1 = bottom, level 6 = top).
 """
 import sys
 from pathlib import Path
+import collections
+import multiprocessing
+import os
 import random
+import shutil
 import itertools
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from generate_figurine import generate_figurine, SHAPE_MENU, SHAPE_WIDTH_RATIOS
 
+# Per-case success lines are noise on headless CI runs; failures and the
+# summary always print. Inherited by the pool workers via the environment.
+VERBOSE = os.environ.get("VERBOSE", "0") == "1"
+
+# SKIP_EXISTING=1 keeps non-empty PNGs from a previous run instead of
+# re-rendering them. Opt-in: the random slots in most stacks differ per
+# run, so skipping silently keeps the prior run's variant for that slot.
+SKIP_EXISTING = os.environ.get("SKIP_EXISTING", "0") == "1"
+
 # Level-specific shape assignments (level 1 = top, level 6 = bottom)
 LEVEL_SHAPES = {
-    1: ["capsule_pill", "semioval", "flat_pyramid_sockel", "stepped_block", "wide_rectangle"],
-    2: ["sphere_circle","sphere_circle","sphere_circle","sphere_circle","sphere_circle","sphere_circle"],
-    3: ["flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle"],
-    4: ["stepped_block_3", "stacked_circles_custom", "rhombus_udlr", "tall_trapezoid", "facing_bowls"],
-    5: ["tall_pyramid", "rhombus_udlr", "stacked_circles","stacked_circles",  "double_upright_pill"],
-    6: ["semioval", "wide_rectangle","wide_rectangle", "capsule_pill", "flat_pyramid", "flat_trapezoid"]
+    1: ("capsule_pill", "semioval", "flat_pyramid_sockel", "stepped_block", "wide_rectangle"),
+    2: ("sphere_circle","sphere_circle","sphere_circle","sphere_circle","sphere_circle","sphere_circle"),
+    3: ("flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle","flat_rectangle"),
+    4: ("stepped_block_3", "stacked_circles_custom", "rhombus_udlr", "tall_trapezoid", "facing_bowls"),
+    5: ("tall_pyramid", "rhombus_udlr", "stacked_circles","stacked_circles",  "double_upright_pill"),
+    6: ("semioval", "wide_rectangle","wide_rectangle", "capsule_pill", "flat_pyramid", "flat_trapezoid")
 }
 
+# Invariant lookup derived from LEVEL_SHAPES once, instead of re-scanning
+# it inside the test-case loops below
+SHAPE_TO_LEVELS = {}
+for _level, _shapes in LEVEL_SHAPES.items():
+    for _shape in _shapes:
+        levels = SHAPE_TO_LEVELS.setdefault(_shape, [])
+        if _level not in levels:
+            levels.append(_level)
+SHAPE_TO_LEVELS = {shape: tuple(levels) for shape, levels in SHAPE_TO_LEVELS.items()}
+
 def get_random_shape_for_level(level):
     """Get a random shape valid for the given level (1-6)."""
     return random.choice(LEVEL_SHAPES[level])
 
+# Lighter than a dict per case and cheaper to pickle to the pool workers
+TestCase = collections.namedtuple('TestCase', 'name shapes title')
+
 def get_random_shapes_stack():
     """Generate a random stack of 6 shapes respecting level constraints."""
     return [get_random_shape_for_level(level) for level in range(1, 7)]
 
+def _render_case(i, test_case, output_dir):
+    """Render a single test case; module-level so Pool can pickle it."""
+    name = test_case.name
+    shapes = test_case.shapes
+    title = test_case.title
+
+    output_path = output_dir / f"{i:03d}_{name}.png"
+
+    if SKIP_EXISTING and output_path.exists() and output_path.stat().st_size > 0:
+        if VERBOSE:
+            print(f"- [{i:3d}] {name:30s} - kept existing output")
+        return name, True
+
+    try:
+        result = generate_figurine(shapes, str(output_path), title)
+        if result:
+            if VERBOSE:
+                print(f"✓ [{i:3d}] {name:30s} - {len(shapes)} shapes")
+            return name, True
+        print(f"✗ [{i:3d}] {name:30s} - FAILED")
+        return name, False
+    except Exception as e:
+        print(f"✗ [{i:3d}] {name:30s} - ERROR: {e}")
+        return name, False
+
 def main():
     # Create output directory
     output_dir = Path("test_outputs")
     output_dir.mkdir(exist_ok=True)
     
     # Get all unique shapes across all levels
-    all_shapes = set()
-    for shapes in LEVEL_SHAPES.values():
-        all_shapes.update(shapes)
-    all_shapes = sorted(all_shapes)
+    all_shapes = sorted(SHAPE_TO_LEVELS)
     
     print(f"Level-specific shapes:")
     for level in range(1, 7):
@@ -53,33 +103,34 @@ def main():
     # Test 1: Each shape in its valid levels
     print("=== Test 1: Individual Shapes in Valid Levels ===")
     for shape in all_shapes:
-        # Find which levels this shape can appear in
-        valid_levels = [level for level, shapes in LEVEL_SHAPES.items() if shape in shapes]
-        
+        # Levels this shape can appear in, precomputed above
+        valid_levels = SHAPE_TO_LEVELS[shape]
+
         # Create a stack with this shape where it's valid, random elsewhere
-        shapes_stack = []
-        for level in range(1, 7):
-            if level in valid_levels:
-                shapes_stack.append(shape)
-            else:
-                shapes_stack.append(get_random_shape_for_level(level))
-        
-        test_cases.append({
-            'name': f"feature_{shape}",
-            'shapes': shapes_stack,
-            'title': f"{shape}\nLvls:{','.join(map(str, valid_levels))}"
-        })
+        shapes_stack = [shape if level in valid_levels else get_random_shape_for_level(level)
+                        for level in range(1, 7)]
+
+        test_cases.append(TestCase(
+            name=f"feature_{shape}",
+            shapes=shapes_stack,
+            title=f"{shape}\nLvls:{','.join(map(str, valid_levels))}"
+        ))
     
     # Test 2: Random 6-shape combinations (100 variations) - respecting levels
     print("=== Test 2: Random 6-Shape Combinations (Level-Aware) ===")
-    random.seed(42)  # For reproducibility
+    # One seeded batch draw of all 100x6 pool indices instead of 600
+    # individual random.choice calls
+    rng = np.random.default_rng(42)  # For reproducibility
+    pool_sizes = np.array([len(LEVEL_SHAPES[level]) for level in range(1, 7)])
+    indices = rng.integers(0, pool_sizes, size=(100, 6))
     for i in range(100):
-        random_shapes = get_random_shapes_stack()
-        test_cases.append({
-            'name': f"random_6stack_{i+1:03d}",
-            'shapes': random_shapes,
-            'title': f"Random\n#{i+1}"
-        })
+        random_shapes = [LEVEL_SHAPES[level][indices[i, level - 1]]
+                         for level in range(1, 7)]
+        test_cases.append(TestCase(
+            name=f"random_6stack_{i+1:03d}",
+            shapes=random_shapes,
+            title=f"Random\n#{i+1}"
+        ))
     
     # Test 3: Each level showcasing all its available shapes
     print("=== Test 3: Level-Specific Showcases ===")
@@ -87,79 +138,75 @@ def main():
         level_shapes = LEVEL_SHAPES[level]
         for i, shape in enumerate(level_shapes):
             # Create a stack with this shape at its level
-            shapes_stack = []
-            for curr_level in range(1, 7):
-                if curr_level == level:
-                    shapes_stack.append(shape)
-                else:
-                    shapes_stack.append(get_random_shape_for_level(curr_level))
-            
-            test_cases.append({
-                'name': f"level{level}_{shape}",
-                'shapes': shapes_stack,
-                'title': f"L{level}:\n{shape}"
-            })
+            shapes_stack = [shape if curr_level == level else get_random_shape_for_level(curr_level)
+                            for curr_level in range(1, 7)]
+
+            test_cases.append(TestCase(
+                name=f"level{level}_{shape}",
+                shapes=shapes_stack,
+                title=f"L{level}:\n{shape}"
+            ))
     
     # Test 4: Width variation patterns (level-aware)
     print("=== Test 4: Width-based Patterns (Level-Aware) ===")
+    # Only two distinct orderings exist per level, so sort each pool once
+    # and pick ascending/descending by iteration parity
+    sorted_by_width = {}
+    for level in range(1, 7):
+        asc = sorted(LEVEL_SHAPES[level], key=lambda s: SHAPE_WIDTH_RATIOS.get(s, 2.0))
+        sorted_by_width[level] = (asc, asc[::-1])
+    # One seeded section-local generator instead of rebuilding the global
+    # Mersenne Twister state on every iteration
+    width_rng = random.Random(200)
     for i in range(20):
-        random.seed(200 + i)
-        # Sort shapes at each level by width
         shapes_stack = []
         for level in range(1, 7):
-            level_shapes = LEVEL_SHAPES[level]
-            sorted_level = sorted(level_shapes, key=lambda s: SHAPE_WIDTH_RATIOS.get(s, 2.0), reverse=(i % 2 == 0))
-            shapes_stack.append(random.choice(sorted_level[:max(1, len(sorted_level)//2)]))
+            sorted_level = sorted_by_width[level][1 if i % 2 == 0 else 0]
+            shapes_stack.append(width_rng.choice(sorted_level[:max(1, len(sorted_level)//2)]))
         
-        test_cases.append({
-            'name': f"width_pattern_{i+1:02d}",
-            'shapes': shapes_stack,
-            'title': f"Width\n#{i+1}"
-        })
+        test_cases.append(TestCase(
+            name=f"width_pattern_{i+1:02d}",
+            shapes=shapes_stack,
+            title=f"Width\n#{i+1}"
+        ))
     
     # Test 5: Repeating patterns where shapes appear in multiple levels
     print("=== Test 5: Multi-Level Shapes ===")
     # Find shapes that appear in multiple levels
-    multi_level_shapes = []
-    for shape in all_shapes:
-        valid_levels = [level for level, shapes in LEVEL_SHAPES.items() if shape in shapes]
-        if len(valid_levels) > 1:
-            multi_level_shapes.append((shape, valid_levels))
+    multi_level_shapes = [(shape, valid_levels)
+                          for shape, valid_levels in sorted(SHAPE_TO_LEVELS.items())
+                          if len(valid_levels) > 1]
     
     for shape, valid_levels in multi_level_shapes:
         # Use this shape in all its valid levels
-        shapes_stack = []
-        for level in range(1, 7):
-            if level in valid_levels:
-                shapes_stack.append(shape)
-            else:
-                shapes_stack.append(get_random_shape_for_level(level))
-        
-        test_cases.append({
-            'name': f"multilevel_{shape}",
-            'shapes': shapes_stack,
-            'title': f"{shape}\nAll Levels"
-        })
+        shapes_stack = [shape if level in valid_levels else get_random_shape_for_level(level)
+                        for level in range(1, 7)]
+
+        test_cases.append(TestCase(
+            name=f"multilevel_{shape}",
+            shapes=shapes_stack,
+            title=f"{shape}\nAll Levels"
+        ))
     
     # Test 6: Consistent choice patterns
     print("=== Test 6: Consistent Patterns ===")
     for i in range(30):
-        random.seed(300 + i)
-        # Pick first available shape at each level
+        # Fully deterministic index pick - the old per-iteration
+        # random.seed here never fed any random call
         shapes_stack = [LEVEL_SHAPES[level][i % len(LEVEL_SHAPES[level])] for level in range(1, 7)]
-        test_cases.append({
-            'name': f"consistent_{i+1:02d}",
-            'shapes': shapes_stack,
-            'title': f"Pattern\n#{i+1}"
-        })
+        test_cases.append(TestCase(
+            name=f"consistent_{i+1:02d}",
+            shapes=shapes_stack,
+            title=f"Pattern\n#{i+1}"
+        ))
     
     # Test 7: Specific interesting patterns (level-aware)
     print("=== Test 7: Specific Patterns ===")
     random.seed(400)
     test_cases.extend([
-        {
-            'name': "all_circles",
-            'shapes': [
+        TestCase(
+            name="all_circles",
+            shapes=[
                 random.choice(LEVEL_SHAPES[1]),  # Level 1
                 random.choice(LEVEL_SHAPES[2]),  # Level 2
                 random.choice(LEVEL_SHAPES[3]),  # Level 3
@@ -167,11 +214,11 @@ def main():
                 "sphere_circle",                  # Level 5 (circles!)
                 random.choice(LEVEL_SHAPES[6])   # Level 6
             ],
-            'title': "Circle\nL5"
-        },
-        {
-            'name': "capsule_bookends",
-            'shapes': [
+            title="Circle\nL5"
+        ),
+        TestCase(
+            name="capsule_bookends",
+            shapes=[
                 "capsule_pill",      # Level 1 (available)
                 get_random_shape_for_level(2),
                 get_random_shape_for_level(3),
@@ -179,11 +226,11 @@ def main():
                 "sphere_circle",     # Level 5
                 "capsule_pill"       # Level 6 (available)
             ],
-            'title': "Capsule\nBookends"
-        },
-        {
-            'name': "semioval_bookends",
-            'shapes': [
+            title="Capsule\nBookends"
+        ),
+        TestCase(
+            name="semioval_bookends",
+            shapes=[
                 "semioval",          # Level 1 (available)
                 get_random_shape_for_level(2),
                 get_random_shape_for_level(3),
@@ -191,11 +238,11 @@ def main():
                 "sphere_circle",     # Level 5
                 "semioval"           # Level 6 (available)
             ],
-            'title': "Semioval\nBookends"
-        },
-        {
-            'name': "rhombus_repeat",
-            'shapes': [
+            title="Semioval\nBookends"
+        ),
+        TestCase(
+            name="rhombus_repeat",
+            shapes=[
                 get_random_shape_for_level(1),
                 "rhombus_udlr",      # Level 2 (available)
                 "rhombus_udlr",      # Level 3 (available)
@@ -203,11 +250,11 @@ def main():
                 "sphere_circle",     # Level 5
                 get_random_shape_for_level(6)
             ],
-            'title': "Rhombus\nL2+L3"
-        },
-        {
-            'name': "pyramid_variety",
-            'shapes': [
+            title="Rhombus\nL2+L3"
+        ),
+        TestCase(
+            name="pyramid_variety",
+            shapes=[
                 "flat_pyramid",      # Level 1 (available)
                 "tall_pyramid",      # Level 2 (available)
                 get_random_shape_for_level(3),
@@ -215,8 +262,8 @@ def main():
                 "sphere_circle",     # Level 5
                 "flat_pyramid_sockel" # Level 6 (available)
             ],
-            'title': "Pyramid\nVariety"
-        }
+            title="Pyramid\nVariety"
+        )
     ])
     
     # Generate all test cases
@@ -224,28 +271,44 @@ def main():
     print(f"Generating {len(test_cases)} test figurines...")
     print(f"{'='*60}\n")
     
-    success_count = 0
-    fail_count = 0
-    
+    # Identical (shapes, title) stacks produce identical PNGs, so render
+    # each distinct stack once and copy the result into duplicate slots
+    first_seen = {}
+    unique_tasks = []
+    duplicates = []
     for i, test_case in enumerate(test_cases, 1):
-        name = test_case['name']
-        shapes = test_case['shapes']
-        title = test_case['title']
-        
-        output_path = output_dir / f"{i:03d}_{name}.png"
-        
-        try:
-            result = generate_figurine(shapes, str(output_path), title)
-            if result:
-                print(f"✓ [{i:3d}/{len(test_cases)}] {name:30s} - {len(shapes)} shapes")
-                success_count += 1
-            else:
-                print(f"✗ [{i:3d}/{len(test_cases)}] {name:30s} - FAILED")
-                fail_count += 1
-        except Exception as e:
-            print(f"✗ [{i:3d}/{len(test_cases)}] {name:30s} - ERROR: {e}")
+        key = (tuple(test_case.shapes), test_case.title)
+        if key in first_seen:
+            duplicates.append((i, test_case.name, key))
+        else:
+            first_seen[key] = (i, test_case.name)
+            unique_tasks.append((i, test_case, output_dir))
+
+    if duplicates:
+        print(f"({len(duplicates)} duplicate stacks render once and are copied)\n")
+
+    # Each case renders independently, so fan out across all cores.
+    # Batching ~4 chunks per worker amortizes the per-task pickling/IPC
+    # while still keeping the workers evenly loaded.
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(unique_tasks) // (4 * workers))
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = pool.starmap(_render_case, unique_tasks, chunksize=chunksize)
+
+    success_count = sum(1 for _, ok in results if ok)
+    fail_count = len(results) - success_count
+
+    # Fill in the duplicates from their rendered originals
+    rendered_ok = {task[0]: ok for task, (_, ok) in zip(unique_tasks, results)}
+    for i, name, key in duplicates:
+        src_i, src_name = first_seen[key]
+        if rendered_ok[src_i]:
+            shutil.copy(output_dir / f"{src_i:03d}_{src_name}.png",
+                        output_dir / f"{i:03d}_{name}.png")
+            success_count += 1
+        else:
             fail_count += 1
-    
+
     # Summary
     print(f"\n{'='*60}")
     print(f"SUMMARY")
@@ -256,13 +319,14 @@ def main():
     print(f"Output directory: {output_dir.absolute()}")
     print(f"{'='*60}\n")
     
-    # List all generated files
-    files = sorted(output_dir.glob("*.png"))
-    print(f"Generated {len(files)} PNG files:")
-    for f in files[:10]:  # Show first 10
-        print(f"  - {f.name}")
-    if len(files) > 10:
-        print(f"  ... and {len(files) - 10} more")
+    # List all generated files; one scandir pass, no Path objects needed
+    with os.scandir(output_dir) as it:
+        names = sorted(e.name for e in it if e.name.endswith('.png'))
+    print(f"Generated {len(names)} PNG files:")
+    for name in names[:10]:  # Show first 10
+        print(f"  - {name}")
+    if len(names) > 10:
+        print(f"  ... and {len(names) - 10} more")
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,16 @@ Test script for the LED Display states.
 Allows interactive testing of all display patterns.
 """
 
+import os
 import sys
 import time
-import glob
 import serial
 
 def get_serial_port():
     """Auto-detect or ask for serial port."""
-    ports = glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*')
+    # One scandir pass over /dev instead of two glob scans
+    with os.scandir('/dev') as it:
+        ports = sorted(e.path for e in it if e.name.startswith(('ttyUSB', 'ttyACM')))
     if not ports:
         print("No serial ports found!")
         return None
@@ -109,11 +109,13 @@ try:
     print(f"   - Need: Klarheit und Orientierung")
     print(f"   - Context: Ich suche nach neuen Möglichkeiten")
     
+    # Reuse the client from test 3 so this call skips a second TLS setup
     result = generate_content_with_gemini(
         answers=sample_answers,
         data_service=data_service,
         figurine_id = 24385,
-        model_name=model_name
+        model_name=model_name,
+        client=client
     )
     
     if result and 'paragraph1' in result and 'paragraph2' in result:
@@ -148,9 +150,12 @@ from content_generation import _rate_limiter
 print(f"   Daily requests made: {_rate_limiter.daily_count}/{_rate_limiter.daily_limit}")
 print(f"   RPM limit: {_rate_limiter.rpm_limit}")
 print(f"   Rate limit file: /tmp/gemini_rate_limit.json")
-if os.path.exists('/tmp/gemini_rate_limit.json'):
+# EAFP: one open instead of an exists() stat followed by the open
+try:
     import json
     with open('/tmp/gemini_rate_limit.json', 'r') as f:
         data = json.load(f)
         print(f"   Stored state: {data}")
+except FileNotFoundError:
+    pass
 
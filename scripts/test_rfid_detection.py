@@ -6,6 +6,7 @@ Tests various RFID tag detection strategies with detailed logging.
 
 import argparse
 import logging
+import operator
 import time
 import sys
 from pathlib import Path
@@ -13,8 +14,6 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from rfid_controller import auto_detect_rfid
-
 
 def setup_logging(verbose=False):
     """Configure logging with detailed output"""
@@ -38,15 +37,15 @@ def run_standard_mode(rfid, target_tags=6, max_attempts=100, use_anti_collision=
     """
     mode_label = "STANDARD (ANTI-COLLISION)" if use_anti_collision else "STANDARD"
     logging.info("=" * 70)
-    logging.info(f"{mode_label} MODE: target={target_tags} tags, max_attempts={max_attempts}")
+    logging.info("%s MODE: target=%d tags, max_attempts=%d", mode_label, target_tags, max_attempts)
     logging.info("=" * 70)
     
     start_time = time.time()
     tags = rfid.read_tags(target_tags=target_tags, max_attempts=max_attempts, use_anti_collision=use_anti_collision)
     elapsed = time.time() - start_time
     
-    logging.info(f"Scan completed in {elapsed:.3f}s")
-    logging.info(f"Tags found: {len(tags)}/{target_tags}")
+    logging.info("Scan completed in %.3fs", elapsed)
+    logging.info("Tags found: %d/%d", len(tags), target_tags)
     
     return tags, elapsed
 
@@ -62,7 +61,7 @@ def run_multi_polling_mode(rfid, target_tags=6, max_duration=60, poll_interval=0
         poll_interval: Time between polls
     """
     logging.info("=" * 70)
-    logging.info(f"MULTI-POLLING MODE: target={target_tags} tags, max_duration={max_duration}s, interval={poll_interval}s")
+    logging.info("MULTI-POLLING MODE: target=%d tags, max_duration=%ds, interval=%ss", target_tags, max_duration, poll_interval)
     logging.info("=" * 70)
     
     start_time = time.time()
@@ -73,8 +72,8 @@ def run_multi_polling_mode(rfid, target_tags=6, max_duration=60, poll_interval=0
     )
     elapsed = time.time() - start_time
     
-    logging.info(f"Scan completed in {elapsed:.3f}s")
-    logging.info(f"Tags found: {len(tags)}/{target_tags}")
+    logging.info("Scan completed in %.3fs", elapsed)
+    logging.info("Tags found: %d/%d", len(tags), target_tags)
     
     return tags, elapsed
 
@@ -90,7 +89,7 @@ def run_reliable_mode(rfid, target_tags=6, max_duration=60, poll_interval=0.05):
         poll_interval: Time between polls
     """
     logging.info("=" * 70)
-    logging.info(f"RELIABLE MODE: target={target_tags} tags, max_duration={max_duration}s, interval={poll_interval}s")
+    logging.info("RELIABLE MODE: target=%d tags, max_duration=%ds, interval=%ss", target_tags, max_duration, poll_interval)
     logging.info("=" * 70)
     
     start_time = time.time()
@@ -101,8 +100,8 @@ def run_reliable_mode(rfid, target_tags=6, max_duration=60, poll_interval=0.05):
     )
     elapsed = time.time() - start_time
     
-    logging.info(f"Scan completed in {elapsed:.3f}s")
-    logging.info(f"Tags found: {len(tags)}/{target_tags}")
+    logging.info("Scan completed in %.3fs", elapsed)
+    logging.info("Tags found: %d/%d", len(tags), target_tags)
     
     return tags, elapsed
 
@@ -124,8 +123,8 @@ def display_tags(tags, mode_name):
         print("=" * 70)
         return
     
-    # Sort by RSSI (strongest first)
-    sorted_tags = sorted(tags, key=lambda t: t['rssi'], reverse=True)
+    # Sort by RSSI (strongest first); itemgetter runs in C
+    sorted_tags = sorted(tags, key=operator.itemgetter('rssi'), reverse=True)
     
     print(f"Total tags detected: {len(sorted_tags)}")
     print("-" * 70)
@@ -137,11 +136,11 @@ def display_tags(tags, mode_name):
     
     print("=" * 70)
     
-    # Calculate statistics
-    rssi_values = [tag['rssi'] for tag in tags]
-    avg_rssi = sum(rssi_values) / len(rssi_values)
-    min_rssi = min(rssi_values)
-    max_rssi = max(rssi_values)
+    # Calculate statistics; sorted_tags is already ordered by RSSI, so
+    # min/max fall out of the ends and only the sum needs a pass
+    max_rssi = sorted_tags[0]['rssi']
+    min_rssi = sorted_tags[-1]['rssi']
+    avg_rssi = sum(tag['rssi'] for tag in sorted_tags) / len(sorted_tags)
     
     print(f"RSSI Statistics: min={min_rssi}, max={max_rssi}, avg={avg_rssi:.1f}")
     print("=" * 70 + "\n")
@@ -162,7 +161,7 @@ def run_continuous_mode(rfid, mode, target_tags=6, use_anti_collision=False):
         mode_label += " (ANTI-COLLISION)"
     
     logging.info("=" * 70)
-    logging.info(f"CONTINUOUS MODE: {mode_label}, target={target_tags} tags")
+    logging.info("CONTINUOUS MODE: %s, target=%d tags", mode_label, target_tags)
     logging.info("Press Ctrl+C to stop")
     logging.info("=" * 70)
     
@@ -283,8 +282,12 @@ Examples:
     print(f"Continuous: {'Yes' if args.continuous else 'No'}")
     print("=" * 70 + "\n")
     
+    # Imported here so --help and argument errors don't pay for the
+    # serial/usb driver stack
+    from rfid_controller import auto_detect_rfid
+
     # Auto-detect RFID reader
-    logging.info(f"Auto-detecting RFID reader (region: {args.region})...")
+    logging.info("Auto-detecting RFID reader (region: %s)...", args.region)
     rfid = auto_detect_rfid(region=args.region)
     
     if not rfid:
@@ -292,7 +295,7 @@ Examples:
         logging.error("Check connections and available serial ports")
         sys.exit(1)
     
-    logging.info(f"✓ RFID reader detected (Region: {args.region}, Power: 26dBm)")
+    logging.info("✓ RFID reader detected (Region: %s, Power: 26dBm)", args.region)
     
     try:
         if args.continuous:
@@ -326,7 +329,7 @@ Examples:
         print("\n\nInterrupted by user")
     
     except Exception as e:
-        logging.error(f"Error during scan: {e}", exc_info=args.verbose)
+        logging.error("Error during scan: %s", e, exc_info=args.verbose)
         sys.exit(1)
     
     finally:
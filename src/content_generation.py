@@ -111,8 +111,20 @@ class GeminiRateLimiter:
 # Global rate limiter instance
 _rate_limiter = GeminiRateLimiter()
 
+# Shared Gemini client: genai.Client sets up its own httpx pool, so
+# building it once lets consecutive generations reuse the warm connection
+_client = None
 
-def generate_content_with_gemini(answers: List[Dict], data_service: DataService, figurine_id: int, model_name: str = GEMINI_MODEL) -> dict:
+
+def _get_client() -> genai.Client:
+    """Return the shared Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = genai.Client(api_key=GEMINI_API_KEY)
+    return _client
+
+
+def generate_content_with_gemini(answers: List[Dict], data_service: DataService, figurine_id: int, model_name: str = GEMINI_MODEL, client: genai.Client = None) -> dict:
     """
     Generate personalized two-paragraph content using Google Gemini API based on user answers.
     Returns empty content if API is unavailable (offline mode handles fallback separately).
@@ -121,7 +133,8 @@ def generate_content_with_gemini(answers: List[Dict], data_service: DataService,
         answers: List of answer dictionaries from the user's tag selection
         data_service: DataService instance to access the prompt template
         model_name: Gemini model to use for generation (default: gemini-1.5-flash)
-        
+        client: Optional pre-built genai.Client; the shared module client is used otherwise
+
     Returns:
         Dictionary with 'paragraph1' and 'paragraph2' keys containing the generated text
     """
@@ -154,8 +167,9 @@ def generate_content_with_gemini(answers: List[Dict], data_service: DataService,
         return empty_content
     
     try:
-        # Configure Gemini API client
-        client = genai.Client(api_key=GEMINI_API_KEY)
+        # Reuse the shared Gemini client unless the caller brought one
+        if client is None:
+            client = _get_client()
 
         # Load prompt template from file
         prompt_path = Path(__file__).parent.parent / 'assets' / 'prompt_template.md'
@@ -249,10 +263,8 @@ def generate_content_with_gemini(answers: List[Dict], data_service: DataService,
                 else:
                     raise  # Re-raise on final attempt
         
-    except Exception as e:
-        logger.error(f"[GEMINI] Failed to generate content: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("[GEMINI] Failed to generate content")
         logger.info("[GEMINI] Returning empty content due to error")
         _save_gemini_output(output_dir, figurine_id, empty_content)
         return empty_content
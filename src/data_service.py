@@ -21,6 +21,25 @@ The DataService class provides functionality to:
 logger = logging.getLogger(__name__)
 
 
+def prevalent_mindset_from_tokens(all_mindsets):
+    """
+    Pick the most frequent mindset from pre-split tokens.
+
+    Callers that already iterate the answers (e.g. to collect SVG names)
+    can gather the tokens in the same pass and hand them here directly.
+    """
+    if not all_mindsets:
+        return None
+
+    # specific logic: if multiple mindsets have same count, pick one?
+    # max over the Counter keeps most_common's first-seen tie-breaking
+    # (dicts preserve insertion order) without sorting the whole dict
+    counts = Counter(all_mindsets)
+    if not counts:
+        return None
+    return max(counts, key=counts.__getitem__)
+
+
 def get_prevalent_mindset(answers):
     """Calculate the most prevalent mindset from answers."""
     all_mindsets = []
@@ -33,15 +52,8 @@ def get_prevalent_mindset(answers):
             # Split by comma and strip whitespace
             parts = [m.strip() for m in m_str.split(',')]
             all_mindsets.extend(parts)
-            
-    if not all_mindsets:
-        return None
-        
-    # specific logic: if multiple mindsets have same count, pick one? most_common handles it (picks first)
-    counts = Counter(all_mindsets)
-    if not counts:
-        return None
-    return counts.most_common(1)[0][0]
+
+    return prevalent_mindset_from_tokens(all_mindsets)
 
 class DataService:
     """Handles reading and querying figurine data from Excel file."""
@@ -65,6 +77,7 @@ class DataService:
         self.titles_df = None
         self.resources_df = None
         self.prompt_df = None
+        self._total_unique_ids = None  # Cached by get_total_unique_ids
         self._load_data()
     
     def _load_data(self):
@@ -174,10 +187,8 @@ class DataService:
             logger.info(f"Found {len(results)}/{len(search_tags)} answers")
             return results
             
-        except Exception as e:
-            logger.error(f"Error searching for answers: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error searching for answers")
             return []
 
     def get_random_title_word(self, category: str) -> str:
@@ -334,19 +345,26 @@ class DataService:
     def get_total_unique_ids(self) -> int:
         """
         Calculate the total number of unique answer set IDs possible.
-        
+
+        The result only changes when new data is loaded, so it is computed
+        once per DataService instance and cached.
+
         Returns:
             Total number of unique combinations
         """
+        if self._total_unique_ids is not None:
+            return self._total_unique_ids
+
         counts = self.get_answers_per_question()
         if not counts:
             return 0
-        
+
         total = 1
         for count in counts:
             total *= count
-        
+
         logger.info(f"Total unique answer set IDs: {total}")
+        self._total_unique_ids = total
         return total
     
     def calculate_answer_set_id(self, answers: List[Dict]) -> Optional[int]:
@@ -416,10 +434,8 @@ class DataService:
             logger.info(f"Answer set ID: {unique_id} (indices: {answer_indices})")
             return unique_id
             
-        except Exception as e:
-            logger.error(f"Error calculating answer set ID: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error calculating answer set ID")
             return None
         
     def _parse_comma_separated_list(self, value: str) -> List[str]:
@@ -479,138 +495,187 @@ class DataService:
         resource_list = self._parse_comma_separated_list(resource_value)
         return 1.0 if target_value in resource_list else 0.0
     
-    def find_best_resource(
+    def _extract_answer_features(self, answers: List[Dict]):
+        """
+        Extract the scoring inputs shared by all categories from the answers:
+        the deduplicated mindsets plus the F05 (Bedürfnisse) and F06
+        (Situation) answers.
+
+        Returns:
+            Tuple of (answer_mindsets, f05_answer, f06_answer)
+        """
+        # Extract mindsets from all answers
+        answer_mindsets = []
+        for answer in answers:
+            mindsets = answer.get('Mindsets')
+            if mindsets and not pd.isna(mindsets):
+                answer_mindsets.extend(self._parse_comma_separated_list(mindsets))
+
+        # Remove duplicates
+        answer_mindsets = list(set(answer_mindsets))
+        logger.debug(f"Collected mindsets from answers: {answer_mindsets}")
+
+        # Find F05 and F06 answers
+        f05_answer = None
+        f06_answer = None
+
+        for answer in answers:
+            frage_id = answer.get('Frage_ID')
+            antwort = answer.get('Antwort')
+
+            if frage_id == 'F05':
+                f05_answer = antwort
+            elif frage_id == 'F06':
+                f06_answer = antwort
+
+        logger.debug(f"F05 answer (Bedürfnisse): {f05_answer}")
+        logger.debug(f"F06 answer (Situation): {f06_answer}")
+
+        return answer_mindsets, f05_answer, f06_answer
+
+    def _find_best_in_category(
         self,
         kategorie: str,
+        answer_mindsets: List[str],
+        f05_answer: Optional[str],
+        f06_answer: Optional[str],
+        mindset_weight: float,
+        f05_weight: float,
+        f06_weight: float
+    ) -> Optional[Dict]:
+        """Score one category's resources against pre-extracted answer features."""
+        # Filter resources by kategorie
+        filtered_resources = self.resources_df[
+            self.resources_df['Kategorie'].str.strip().str.lower() == kategorie.strip().lower()
+        ]
+
+        if filtered_resources.empty:
+            logger.warning(f"No resources found for kategorie: {kategorie}")
+            return None
+
+        logger.info(f"Found {len(filtered_resources)} resources in kategorie '{kategorie}'")
+
+        # Calculate scores for each resource
+        best_score = -1
+        best_resource = None
+
+        for idx, resource in filtered_resources.iterrows():
+            # Calculate individual scores
+            mindset_score = self._calculate_mindsets_score(
+                resource.get('Mindsets', ''),
+                answer_mindsets
+            )
+
+            f05_score = self._calculate_match_score(
+                resource.get('Bedürfnisse', ''),
+                f05_answer
+            ) if f05_answer else 0.0
+
+            f06_score = self._calculate_match_score(
+                resource.get('Situation', ''),
+                f06_answer
+            ) if f06_answer else 0.0
+
+            # Calculate weighted total score
+            total_weight = mindset_weight + f05_weight + f06_weight
+            weighted_score = (
+                mindset_score * mindset_weight +
+                f05_score * f05_weight +
+                f06_score * f06_weight
+            ) / total_weight if total_weight > 0 else 0.0
+
+            # Track best score
+            if weighted_score > best_score:
+                best_score = weighted_score
+                best_resource = resource
+
+        # If no clear winner (all scores equal), pick the first one
+        if best_resource is None and not filtered_resources.empty:
+            best_resource = filtered_resources.iloc[0]
+            logger.info("All resources scored equally, selecting first resource")
+
+        if best_resource is not None:
+            logger.info(
+                f"Selected resource: '{best_resource.get('Item', '')}' "
+                f"with score {best_score:.2f}"
+            )
+            return best_resource.to_dict()
+
+        return None
+
+    def find_best_resources(
+        self,
+        kategorien: List[str],
         answers: List[Dict],
         mindset_weight: float = 1.0,
         f05_weight: float = 1.0,
         f06_weight: float = 1.0
-    ) -> Optional[Dict]:
+    ) -> Dict[str, Optional[Dict]]:
         """
-        Find the best matching resource from the Ressourcen sheet based on kategorie
-        and matching mindsets, F05 answer (Bedürfnisse), and F06 answer (Situation).
-        
+        Find the best matching resource for several categories in one pass.
+
+        The answer features (mindsets, F05, F06) are extracted once and
+        reused for every category, instead of being recomputed per
+        find_best_resource call.
+
         Args:
-            kategorie: The category to filter resources by (e.g., 'Tools & Inspiration')
+            kategorien: Categories to look up (e.g., ['Tools & Inspiration', ...])
             answers: List of answer dictionaries (as returned by find_answer_by_tags)
             mindset_weight: Weight for mindset matching (default 1.0)
             f05_weight: Weight for F05 (Bedürfnisse) matching (default 1.0)
             f06_weight: Weight for F06 (Situation) matching (default 1.0)
-            
+
         Returns:
-            Dictionary containing the best matching resource row, or None if no resources found
+            Dictionary mapping each kategorie to its best resource row (or None)
         """
         if self.resources_df is None:
             logger.error("No resources data loaded")
-            return None
-        
+            return {kategorie: None for kategorie in kategorien}
+
         if not answers:
             logger.error("No answers provided")
-            return None
-        
+            return {kategorie: None for kategorie in kategorien}
+
         try:
-            # Filter resources by kategorie
-            filtered_resources = self.resources_df[
-                self.resources_df['Kategorie'].str.strip().str.lower() == kategorie.strip().lower()
-            ]
-            
-            if filtered_resources.empty:
-                logger.warning(f"No resources found for kategorie: {kategorie}")
-                return None
-            
-            logger.info(f"Found {len(filtered_resources)} resources in kategorie '{kategorie}'")
-            
-            # Extract mindsets from all answers
-            answer_mindsets = []
-            for answer in answers:
-                mindsets = answer.get('Mindsets')
-                if mindsets and not pd.isna(mindsets):
-                    answer_mindsets.extend(self._parse_comma_separated_list(mindsets))
-            
-            # Remove duplicates
-            answer_mindsets = list(set(answer_mindsets))
-            logger.debug(f"Collected mindsets from answers: {answer_mindsets}")
-            
-            # Find F05 and F06 answers
-            f05_answer = None
-            f06_answer = None
-            
-            for answer in answers:
-                frage_id = answer.get('Frage_ID')
-                antwort = answer.get('Antwort')
-                
-                if frage_id == 'F05':
-                    f05_answer = antwort
-                elif frage_id == 'F06':
-                    f06_answer = antwort
-            
-            logger.debug(f"F05 answer (Bedürfnisse): {f05_answer}")
-            logger.debug(f"F06 answer (Situation): {f06_answer}")
-            
-            # Calculate scores for each resource
-            best_score = -1
-            best_resource = None
-            scores = []
-            
-            for idx, resource in filtered_resources.iterrows():
-                # Calculate individual scores
-                mindset_score = self._calculate_mindsets_score(
-                    resource.get('Mindsets', ''),
-                    answer_mindsets
-                )
-                
-                f05_score = self._calculate_match_score(
-                    resource.get('Bedürfnisse', ''),
-                    f05_answer
-                ) if f05_answer else 0.0
-                
-                f06_score = self._calculate_match_score(
-                    resource.get('Situation', ''),
-                    f06_answer
-                ) if f06_answer else 0.0
-                
-                # Calculate weighted total score
-                total_weight = mindset_weight + f05_weight + f06_weight
-                weighted_score = (
-                    mindset_score * mindset_weight +
-                    f05_score * f05_weight +
-                    f06_score * f06_weight
-                ) / total_weight if total_weight > 0 else 0.0
-                
-                scores.append({
-                    'index': idx,
-                    'item': resource.get('Item', ''),
-                    'mindset_score': mindset_score,
-                    'f05_score': f05_score,
-                    'f06_score': f06_score,
-                    'total_score': weighted_score
-                })
-                
-                # Track best score
-                if weighted_score > best_score:
-                    best_score = weighted_score
-                    best_resource = resource
-            
-            # If no clear winner (all scores equal), pick the first one
-            if best_resource is None and not filtered_resources.empty:
-                best_resource = filtered_resources.iloc[0]
-                logger.info("All resources scored equally, selecting first resource")
-            
-            if best_resource is not None:
-                logger.info(
-                    f"Selected resource: '{best_resource.get('Item', '')}' "
-                    f"with score {best_score:.2f}"
+            answer_mindsets, f05_answer, f06_answer = self._extract_answer_features(answers)
+
+            return {
+                kategorie: self._find_best_in_category(
+                    kategorie, answer_mindsets, f05_answer, f06_answer,
+                    mindset_weight, f05_weight, f06_weight
                 )
-                return best_resource.to_dict()
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error finding best resource: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return None
+                for kategorie in kategorien
+            }
+
+        except Exception:
+            logger.exception("Error finding best resources")
+            return {kategorie: None for kategorie in kategorien}
+
+    def find_best_resource(
+        self,
+        kategorie: str,
+        answers: List[Dict],
+        mindset_weight: float = 1.0,
+        f05_weight: float = 1.0,
+        f06_weight: float = 1.0
+    ) -> Optional[Dict]:
+        """
+        Find the best matching resource from the Ressourcen sheet based on kategorie
+        and matching mindsets, F05 answer (Bedürfnisse), and F06 answer (Situation).
+
+        Args:
+            kategorie: The category to filter resources by (e.g., 'Tools & Inspiration')
+            answers: List of answer dictionaries (as returned by find_answer_by_tags)
+            mindset_weight: Weight for mindset matching (default 1.0)
+            f05_weight: Weight for F05 (Bedürfnisse) matching (default 1.0)
+            f06_weight: Weight for F06 (Situation) matching (default 1.0)
+
+        Returns:
+            Dictionary containing the best matching resource row, or None if no resources found
+        """
+        return self.find_best_resources(
+            [kategorie], answers, mindset_weight, f05_weight, f06_weight
+        ).get(kategorie)
     
     def get_prompt(self) -> str:
         """
@@ -643,8 +708,6 @@ class DataService:
             logger.info(f"Loaded prompt template with {len(prompt_parts)} sections, {len(prompt_text)} characters")
             return prompt_text
             
-        except Exception as e:
-            logger.error(f"Error getting prompt template: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error getting prompt template")
             return ""
\ No newline at end of file
@@ -2,6 +2,7 @@ import serial
 import time
 import glob
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -107,47 +108,53 @@ class DisplayController:
         if self.ser.is_open:
             self.ser.close()
 
-def auto_detect_display():
-    """
-    Auto-detect the LED Display ESP32 on available serial ports.
-    Sends 'STATUS' and expects 'OK PATTERN=...'
-    """
-    # Try ACM ports first (ESP32 is typically on ttyACM*)
-    ports = sorted(glob.glob('/dev/ttyACM*')) + sorted(glob.glob('/dev/ttyUSB*'))
-    
-    if not ports:
-        return None
-    
-    for port in ports:
+def _probe_display_port(port):
+    """Probe one serial port for the display's STATUS handshake."""
+    try:
+        # Try to open serial port
+        ser = serial.Serial(port, 115200, timeout=2)
         try:
-            # Try to open serial port
-            ser = serial.Serial(port, 115200, timeout=2)
             time.sleep(2) # Wait for boot
-            
+
             # Clear buffer
             ser.reset_input_buffer()
-            
+
             # Send STATUS command
             ser.write(b"STATUS\n")
-            
+
             # Check response
             start = time.time()
-            found = False
             while time.time() - start < 2.0:
                 if ser.in_waiting:
                     line = ser.readline().decode('utf-8', errors='ignore').strip()
                     if "OK PATTERN=" in line:
-                        found = True
-                        break
+                        return port
                 time.sleep(0.05)
-            
+        finally:
             ser.close()
-            
-            if found:
+    except Exception as e:
+        # logger.debug(f"Probe failed for {port}: {e}")
+        pass
+
+    return None
+
+def auto_detect_display():
+    """
+    Auto-detect the LED Display ESP32 on available serial ports.
+    Sends 'STATUS' and expects 'OK PATTERN=...'
+    """
+    # Try ACM ports first (ESP32 is typically on ttyACM*)
+    ports = sorted(glob.glob('/dev/ttyACM*')) + sorted(glob.glob('/dev/ttyUSB*'))
+
+    if not ports:
+        return None
+
+    # Each probe spends ~4s on boot wait + handshake, so race all
+    # candidate ports at once instead of walking them serially; map()
+    # preserves the ACM-first preference order
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        for port in executor.map(_probe_display_port, ports):
+            if port:
                 return DisplayController(port)
-                
-        except Exception as e:
-            # logger.debug(f"Probe failed for {port}: {e}")
-            pass
-    
+
     return None
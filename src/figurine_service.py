@@ -8,6 +8,7 @@ import sys
 import time
 import logging
 import argparse
+import random
 import subprocess
 import socket
 
@@ -207,7 +208,6 @@ def main():
             if figurine_id is None:
                 logger.error("Failed to calculate figurine ID, using fallback")
                 # Fallback to random ID if calculation fails
-                import random
                 figurine_id = random.randint(1, 27000)
             
             logger.info(f"Calculated Figurine ID: {figurine_id}")
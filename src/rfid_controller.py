@@ -8,6 +8,8 @@ import serial
 import time
 import glob
 import logging
+import selectors
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Setup logging only if running standalone
 if __name__ == "__main__":
@@ -41,6 +43,24 @@ class M5StackUHF:
         self.ser = serial.Serial(port, baud, timeout=0.5)
         self.buffer = bytearray()
         self.region = region
+
+        # Enable ASYNC_LOW_LATENCY on the tty: disables the driver's
+        # read-coalescing timer so frames reach us without the 1-10ms
+        # buffering delay. Not supported on all platforms/adapters.
+        try:
+            self.ser.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError):
+            logger.debug(f"Low latency mode not supported on {port}")
+
+        # Register the serial fd with a selector (epoll on Linux) so
+        # response waits block until bytes arrive instead of issuing an
+        # in_waiting ioctl every millisecond. Not all platforms expose a
+        # selectable fd (Windows) - fall back to in_waiting polling there.
+        try:
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(self.ser.fileno(), selectors.EVENT_READ)
+        except (OSError, ValueError, AttributeError):
+            self._sel = None
         time.sleep(0.5)  # Allow module to initialize
         
         # Set region first (affects frequency band)
@@ -51,7 +71,8 @@ class M5StackUHF:
         
     def _checksum(self, data):
         """Calculate checksum (sum of bytes from index 1 to n-2)"""
-        return sum(data[1:-2]) & 0xFF
+        # memoryview avoids copying the slice before summing
+        return sum(memoryview(data)[1:-2]) & 0xFF
     
     def _send_command(self, cmd):
         """Send command to RFID module"""
@@ -62,7 +83,26 @@ class M5StackUHF:
         """Wait for response frame (0xBB...0x7E)"""
         start = time.time()
         self.buffer = bytearray()
-        
+
+        if self._sel is not None:
+            # Block in the selector until bytes arrive - zero syscalls
+            # while idle instead of one in_waiting ioctl per millisecond
+            while True:
+                remaining = timeout - (time.time() - start)
+                if remaining <= 0 or not self._sel.select(remaining):
+                    return False
+                try:
+                    chunk = self.ser.read(self.ser.in_waiting or 1)
+                except Exception as e:
+                    logger.error(f"Read error: {e}")
+                    return False
+                for byte in chunk:
+                    self.buffer.append(byte)
+                    if byte == 0x7E and self.buffer[0] == 0xBB:
+                        # logger.debug(f"Received: {self.buffer.hex().upper()}")
+                        return True
+
+        # Fallback: active in_waiting polling (platforms without a selectable fd)
         while time.time() - start < timeout:
             if self.ser.in_waiting:
                 try:
@@ -81,6 +121,53 @@ class M5StackUHF:
                 time.sleep(0.001)
         return False
     
+    def _drain_frames(self, first_timeout=0.5, idle_timeout=0.1):
+        """
+        Bulk-read all response frames (0xBB...0x7E) currently arriving.
+
+        Reads whole chunks via in_waiting instead of one byte per loop
+        iteration, so multi-polling cycles that return many back-to-back
+        tag frames are split in a single pass.
+
+        Args:
+            first_timeout: Max time to wait for the first frame (seconds)
+            idle_timeout: Max quiet time after data before giving up (seconds)
+
+        Returns:
+            List of complete frames as bytes objects
+        """
+        frames = []
+        buffer = bytearray()
+        deadline = time.time() + first_timeout
+
+        while time.time() < deadline:
+            waiting = self.ser.in_waiting
+            if not waiting:
+                time.sleep(0.001)
+                continue
+
+            buffer.extend(self.ser.read(waiting))
+            # Extract all complete frames from the buffer
+            while True:
+                try:
+                    start = buffer.index(0xBB)
+                    end = buffer.index(0x7E, start)
+                except ValueError:
+                    break
+                frame = bytes(buffer[start:end + 1])
+                del buffer[:end + 1]
+                # Validate the frame checksum; drop corrupted frames
+                # instead of propagating bogus EPCs
+                if len(frame) >= 7 and frame[-2] == self._checksum(frame):
+                    frames.append(frame)
+                else:
+                    logger.debug(f"Dropping frame with bad checksum: {frame.hex().upper()}")
+
+            # Data arrived - only wait a short idle window for trailing frames
+            deadline = time.time() + idle_timeout
+
+        return frames
+
     def _get_hardware_version(self):
         """Get hardware version (used for auto-detection)"""
         cmd = [0xBB, 0x00, 0x03, 0x00, 0x01, 0x00, 0x04, 0x7E]
@@ -334,30 +421,18 @@ class M5StackUHF:
             cmd = [0xBB, 0x00, 0x22, 0x00, 0x00, 0x22, 0x7E]
         
         self._send_command(cmd)
-        
+
+        # Drain all notification frames in bulk, then parse tag frames
         tags = []
-        if not self._wait_response(timeout=0.5):
-            return tags
-        
-        # Process first response
-        if len(self.buffer) >= 24 and self.buffer[0] == 0xBB and self.buffer[1] == 0x02:
-            tag = {
-                'rssi': self.buffer[5],
-                'pc': self.buffer[6:8].hex().upper(),
-                'epc': self.buffer[8:20].hex().upper(),
-            }
-            tags.append(tag)
-        
-        # Check for additional responses (multi-polling allows more)
-        while self._wait_response(timeout=0.1):
-            if len(self.buffer) >= 24 and self.buffer[0] == 0xBB and self.buffer[1] == 0x02:
+        for frame in self._drain_frames(first_timeout=0.5, idle_timeout=0.1):
+            if len(frame) >= 24 and frame[0] == 0xBB and frame[1] == 0x02:
                 tag = {
-                    'rssi': self.buffer[5],
-                    'pc': self.buffer[6:8].hex().upper(),
-                    'epc': self.buffer[8:20].hex().upper(),
+                    'rssi': frame[5],
+                    'pc': frame[6:8].hex().upper(),
+                    'epc': frame[8:20].hex().upper(),
                 }
                 tags.append(tag)
-        
+
         return tags
     
     def has_tags_present(self, confirmation_reads=2):
@@ -379,39 +454,71 @@ class M5StackUHF:
     
     def close(self):
         """Close serial connection"""
+        if self._sel is not None:
+            self._sel.close()
+            self._sel = None
         if self.ser.is_open:
             self.ser.close()
 
 
+def _probe_port(port, region):
+    """
+    Probe a single serial port for the RFID module.
+
+    Args:
+        port: Serial port to probe (e.g., '/dev/ttyUSB0')
+        region: Region code to initialize with
+
+    Returns:
+        M5StackUHF instance if the module answered, None otherwise
+    """
+    try:
+        logger.info(f"Probing {port} for RFID...")
+        rfid = M5StackUHF(port, region=region)
+        if rfid._get_hardware_version():
+            logger.info(f"RFID found on {port} with region {region}")
+            return rfid
+        rfid.close()
+    except Exception as e:
+        logger.debug(f"Probe failed for {port}: {e}")
+    return None
+
+
 def auto_detect_rfid(region='EU'):
     """
     Auto-detect the M5Stack UHF RFID module on available serial ports.
-    
+
+    All candidate ports are probed concurrently: each probe pays the
+    module's ~0.5s init sleep plus region/power round-trips, so probing
+    serially costs ~1.5s per port. The probes are I/O-bound on separate
+    devices, so a thread pool overlaps them.
+
     Args:
         region: Region code ('US', 'EU', 'CN', 'IN', 'JP') - default: 'EU'
-    
+
     Returns:
         M5StackUHF instance if found, None otherwise
     """
     # Try USB ports first (RFID is typically on ttyUSB*)
     ports = sorted(glob.glob('/dev/ttyUSB*')) + sorted(glob.glob('/dev/ttyACM*'))
-    
+
     if not ports:
         return None
-    
-    for port in ports:
-        try:
-            logger.info(f"Probing {port} for RFID...")
-            rfid = M5StackUHF(port, region=region)
-            if rfid._get_hardware_version():
-                logger.info(f"RFID found on {port} with region {region}")
-                return rfid
-            rfid.close()
-        except Exception as e:
-            logger.debug(f"Probe failed for {port}: {e}")
-            pass
-    
-    return None
+
+    winner = None
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        futures = [executor.submit(_probe_port, port, region) for port in ports]
+        for future in as_completed(futures):
+            rfid = future.result()
+            if rfid is None:
+                continue
+            if winner is None:
+                winner = rfid
+            else:
+                # More than one port answered (shouldn't happen) - keep the first
+                rfid.close()
+
+    return winner
 
 
 # Example usage
@@ -10,45 +10,88 @@ To add a new shape:
 """
 import drawsvg as draw
 from pathlib import Path
+import copy
+import functools
+import io
+import logging
 import math
+import os
+import shutil
+import subprocess
+import tempfile
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
 # SHAPE DRAWING FUNCTIONS
 # =============================================================================
 
+# Shared style attributes for raw SVG templates. Emitting pre-formatted
+# markup via draw.Raw skips drawsvg's per-element attribute-dict
+# machinery, which dominates when many shapes are generated (catalogs).
+_RAW_STYLE = 'fill="white" stroke="black" stroke-width="2" vector-effect="non-scaling-stroke"'
+
+
+def _raw_path(d):
+    """Build a styled <path> element from a pre-formatted path string."""
+    return draw.Raw(f'<path d="{d}" {_RAW_STYLE} />')
+
+
+def _raw_rect(w, h, rx=None, ry=None):
+    """Build a styled <rect> element, optionally with rounded corners."""
+    corners = f' rx="{rx}" ry="{ry}"' if rx is not None else ''
+    return draw.Raw(f'<rect x="0" y="0" width="{w}" height="{h}"{corners} {_RAW_STYLE} />')
+
+
+# Shared style kwargs for the straight-edged polygon shapes
+_LINE_STYLE = dict(close=True, fill='white', stroke='black', stroke_width=2,
+                   vector_effect='non-scaling-stroke')
+
+# Unit-square vertex tables: (x, y) in [0, 1], scaled by width/height in _poly.
+# Precomputing these avoids redoing the ratio arithmetic on every call.
+_VERTS_TAPERED_TRAPEZOID = ((0.35, 0), (0.65, 0), (1, 1), (0, 1))
+_VERTS_BLOCKY_TRAPEZOID = ((0.1, 0), (0.9, 0), (1, 1), (0, 1))
+_VERTS_PYRAMID = ((0, 1), (1, 1), (0.5, 0))
+_VERTS_FLAT_TRAPEZOID = ((0, 1), (1, 1), (0.85, 0), (0.15, 0))
+_VERTS_RHOMBUS_UDLR = ((0.5, 0), (1, 0.5), (0.5, 1), (0, 0.5))
+_VERTS_TALL_TRAPEZOID = ((0, 1), (1, 1), (2/3, 0), (1/3, 0))
+
+
+def _poly(verts, h, w):
+    """Build a closed polygon from unit-square vertices scaled to w x h."""
+    coords = [c for x, y in verts for c in (x * w, y * h)]
+    return draw.Lines(*coords, **_LINE_STYLE)
+
+
 # --- Original Reference Shapes ---
 
 def draw_wide_semioval(h):
     """Shape 1: Squashed top-half semi-oval"""
     w = h * 2.5
-    path = draw.Path(fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
-    path.M(0, h).A(w/2, h, 0, 0, 1, w, h).L(w, h).Z()
-    return path
+    return _raw_path(f'M0,{h} A{w/2},{h} 0 0 1 {w},{h} L{w},{h} Z')
 
 
 def draw_wide_rectangle(h):
     """Shape 2 & 5: Standard wide rectangle block"""
     w = h * 2.2
-    return draw.Rectangle(0, 0, w, h, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _raw_rect(w, h)
 
 
 def draw_capsule_pill(h):
     """Shape 3: Flat-sided pill shape (capsule)"""
     w = h * 2.5
-    return draw.Rectangle(0, 0, w, h, rx=h/2, ry=h/2, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _raw_rect(w, h, rx=h/2, ry=h/2)
 
 
 def draw_tapered_trapezoid(h):
     """Shape 4: Narrow-top trapezoid"""
-    w = h * 2.5
-    return draw.Lines(w*0.35, 0, w*0.65, 0, w, h, 0, h, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_TAPERED_TRAPEZOID, h, h * 2.5)
 
 
 def draw_blocky_trapezoid(h):
     """Shape 6: Steep-walled trapezoid"""
-    w = h * 2.0
-    return draw.Lines(w*0.1, 0, w*0.9, 0, w, h, 0, h, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_BLOCKY_TRAPEZOID, h, h * 2.0)
 
 
 # --- Stacked & Composite Shapes ---
@@ -69,55 +112,46 @@ def draw_sphere_circle(h):
     """A perfect circle/sphere shape"""
     r = h / 2
     # Circle centered at (r, r) means bounding box is (0, 0) to (h, h)
-    return draw.Circle(r, r, r, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return draw.Raw(f'<circle cx="{r}" cy="{r}" r="{r}" {_RAW_STYLE} />')
 
 
 # --- Flat/Wide Shapes ---
 
 def draw_flat_pyramid(h):
     """Very flat pyramid (wide base, very low height)"""
-    w = h * 4.0
-    return draw.Lines(0, h, w, h, w/2, 0, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_PYRAMID, h, h * 4.0)
 
 
 def draw_flat_rectangle(h):
     """Very flat, wide rectangle"""
     w = h * 6.0
-    return draw.Rectangle(0, 0, w, h, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _raw_rect(w, h)
 
 
 def draw_flat_pressed_oval(h):
     """Very flat, wide oval"""
     w = h * 4.0
     # Ellipse centered at (w/2, h/2) means bounding box is (0, 0) to (w, h)
-    return draw.Ellipse(w/2, h/2, w/2, h/2, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return draw.Raw(f'<ellipse cx="{w/2}" cy="{h/2}" rx="{w/2}" ry="{h/2}" {_RAW_STYLE} />')
 
 
 def draw_flat_trapezoid(h):
     """Very flat trapezoid, top slightly narrower than bottom"""
-    w = h * 4.0
-    top_w = w * 0.7
-    left_top_x = (w - top_w) / 2
-    right_top_x = left_top_x + top_w
-    return draw.Lines(0, h, w, h, right_top_x, 0, left_top_x, 0, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_FLAT_TRAPEZOID, h, h * 4.0)
 
 
 # --- Tall/Narrow Shapes ---
 
 def draw_tall_pyramid(h):
     """Pyramid with base 2/3 of the height"""
-    w = h * (2/3)
     # Draw from (0,0) origin - pyramid tip at (w/2, 0)
-    return draw.Lines(0, h, w, h, w/2, 0, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_PYRAMID, h, h * (2/3))
 
 
 def draw_rhombus_udlr(h):
     """Rhombus with corners up, down, left, right. Width at center is 2/3 of height."""
-    w = h * (2/3)
     # Draw from (0,0) origin - center at (w/2, h/2)
-    cx = w / 2
-    cy = h / 2
-    return draw.Lines(cx, 0, w, cy, cx, h, 0, cy, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _poly(_VERTS_RHOMBUS_UDLR, h, h * (2/3))
 
 
 def draw_stacked_circles(h):
@@ -162,43 +196,36 @@ def draw_stacked_circles(h):
     return path
 
 
+# Precomputed unit-height geometry for draw_stacked_circles_custom.
+# With upper_r = 6h/49, lower_r = 20h/49 the center distance is d = 23h/49,
+# so the circle-circle intersection is a fixed fraction of h:
+#   a = (d² + upper_r² - lower_r²) / (2d)   (distance from top center)
+#   h_intersect = sqrt(upper_r² - a²)       (half-width at intersection)
+_SCC_A_RATIO = ((23/49)**2 + (6/49)**2 - (20/49)**2) / (2 * (23/49))
+_SCC_HINT_RATIO = math.sqrt((6/49)**2 - _SCC_A_RATIO**2)
+_SCC_INTERSECT_Y_RATIO = 6/49 + _SCC_A_RATIO
+
+
 def draw_stacked_circles_custom(h):
     """Two stacked circles (small on top, large on bottom), slightly overlapping."""
-    # Calculate radii so total height = h with overlap, maintaining 1.5:5 ratio
-    # With ratio 1.5:5 and overlap = 0.5*upper_r:
-    # upper_r = 6h/49, lower_r = 20h/49 makes total height exactly h
+    # Radii maintain the 1.5:5 ratio with overlap = 0.5*upper_r, so the
+    # total height is exactly h. The intersection geometry is linear in h
+    # and precomputed at import time (see ratios above).
     upper_r = (6 * h) / 49
     lower_r = (20 * h) / 49
-    
-    overlap = upper_r * 0.5  # Overlap amount
-    
-    # Width is determined by the larger circle (lower_r)
-    w = 2 * lower_r
-    
-    # Centers (both circles centered horizontally at lower_r)
-    cx = lower_r  # Center x at larger radius
-    top_cy = upper_r  # Top circle center (so top edge is at 0)
-    bottom_cy = h - lower_r  # Bottom circle center (so bottom edge is at h)
-    
-    # For different sized circles, intersection calculation is more complex
-    # Distance between centers
-    d = bottom_cy - top_cy
-    
-    # Intersection points for two circles with different radii
-    # Using formula for circle-circle intersection
-    # x = (d² + r1² - r2²) / (2d) gives distance from center1 to intersection line
-    a = (d*d + upper_r*upper_r - lower_r*lower_r) / (2*d)
-    h_intersect = math.sqrt(upper_r*upper_r - a*a)  # Half-width at intersection
-    
-    # Intersection y-coordinate (from top circle center)
-    intersect_y = top_cy + a
-    
+
+    # Both circles are centered horizontally at lower_r
+    cx = lower_r
+
+    h_intersect = _SCC_HINT_RATIO * h  # Half-width at intersection
+    intersect_y = _SCC_INTERSECT_Y_RATIO * h  # Intersection y-coordinate
+
     left_x = cx - h_intersect
     right_x = cx + h_intersect
-    
+
     # Draw figure-8 outline
     path = draw.Path(fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
-    
+
     # Start at left intersection point
     path.M(left_x, intersect_y)
     # Arc over the top of upper circle to right intersection (large arc for smaller circle)
@@ -206,16 +233,15 @@ def draw_stacked_circles_custom(h):
     # Arc under the bottom of lower circle back to left intersection (large arc for bigger circle)
     path.A(lower_r, lower_r, 0, 1, 1, left_x, intersect_y)
     path.Z()
-    
+
     return path
-    return group
 
 
 def draw_upright_pill(h):
     """Pill standing upright, height 6 units, circumference 4 units."""
     width = 10 / math.pi
     w = h * (width / 6)
-    return draw.Rectangle(0, 0, w, h, rx=w/2, ry=w/2, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    return _raw_rect(w, h, rx=w/2, ry=w/2)
 
 
 # --- New Custom Shapes ---
@@ -241,11 +267,8 @@ def draw_flat_pyramid_sockel(h):
 
 def draw_tall_trapezoid(h):
     """Tall trapezoid similar to tall_pyramid, top is 1/3 of bottom width."""
-    w = h * (2/3)  # Same width ratio as tall_pyramid
-    top_w = w / 3
-    left_top_x = (w - top_w) / 2
-    right_top_x = left_top_x + top_w
-    return draw.Lines(0, h, w, h, right_top_x, 0, left_top_x, 0, close=True, fill='white', stroke='black', stroke_width=2, vector_effect='non-scaling-stroke')
+    # Same width ratio as tall_pyramid
+    return _poly(_VERTS_TALL_TRAPEZOID, h, h * (2/3))
 
 def draw_stepped_block_3(h):
     """3-layer stepped block: bottom narrowest, middle widest, top medium."""
@@ -420,25 +443,70 @@ SHAPE_WIDTH_RATIOS = {
 }
 
 
+def _rebuild_ratio_index():
+    """Rebuild the tuple-indexed lookups from SHAPE_MENU / SHAPE_WIDTH_RATIOS."""
+    global _SHAPE_INDEX, _SHAPE_RATIOS, _SHAPE_FUNCS
+    # Each tuple is built fully before the module global is swapped, so
+    # concurrent readers always see a consistent snapshot.
+    _SHAPE_INDEX = {name: i for i, name in enumerate(SHAPE_WIDTH_RATIOS)}
+    _SHAPE_RATIOS = tuple(SHAPE_WIDTH_RATIOS.values())
+    _SHAPE_FUNCS = tuple(SHAPE_MENU.get(name) for name in SHAPE_WIDTH_RATIOS)
+
+
+# Parallel name→index / index→ratio/function arrays so hot paths resolve
+# a shape once by name and then work with integer indices (one indexed
+# load instead of a string hash per call).
+_rebuild_ratio_index()
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+@functools.lru_cache(maxsize=1024)
+def _get_shape_cached(name: str, height_key: int):
+    """Build a shape at height height_key/10 (height quantized to 0.1px)."""
+    return SHAPE_MENU[name](height_key / 10)
+
+
 def get_shape(name: str, height: float):
     """
     Get a shape element by name.
-    
+
+    Results are memoized per (name, height rounded to 0.1px), so repeated
+    requests for the same shape at the same size - the common case when
+    batch-generating figurines - skip geometry construction entirely. The
+    returned element is a shallow copy of the cached one; treat it as
+    immutable (re-parenting it into a Drawing is fine, mutating its
+    children is not).
+
     Args:
         name: Shape name from SHAPE_MENU
         height: Height of the shape
-        
+
     Returns:
         drawsvg element or None if shape not found
     """
     if name not in SHAPE_MENU:
-        print(f"Warning: Shape '{name}' not found in SHAPE_MENU")
+        logger.warning("Shape '%s' not found in SHAPE_MENU", name)
         return None
-    return SHAPE_MENU[name](height)
+    return copy.copy(_get_shape_cached(name, int(round(height * 10))))
+
+
+def get_shape_index(name: str):
+    """Resolve a shape name to its integer index, or None if unknown."""
+    return _SHAPE_INDEX.get(name)
+
+
+def get_shape_by_index(index: int, height: float):
+    """
+    Index-based variant of get_shape for batch callers.
+
+    Resolve the index once with get_shape_index, then call this in the
+    hot loop to skip the per-call string hash. Indices are stable until
+    register_shape runs.
+    """
+    return _SHAPE_FUNCS[index](height)
 
 
 def get_shape_width(name: str, height: float) -> float:
@@ -452,8 +520,8 @@ def get_shape_width(name: str, height: float) -> float:
     Returns:
         Width of the shape
     """
-    ratio = SHAPE_WIDTH_RATIOS.get(name, 2.5)
-    return height * ratio
+    idx = _SHAPE_INDEX.get(name)
+    return height * (_SHAPE_RATIOS[idx] if idx is not None else 2.5)
 
 
 def list_shapes() -> list:
@@ -478,13 +546,103 @@ def register_shape(name: str, draw_func, width_ratio: float):
     """
     SHAPE_MENU[name] = draw_func
     SHAPE_WIDTH_RATIOS[name] = width_ratio
-    print(f"Registered shape: {name}")
+    _rebuild_ratio_index()
+    _get_shape_cached.cache_clear()
+    logger.info("Registered shape: %s", name)
 
 
 # =============================================================================
 # GRID VISUALIZATION / TESTING
 # =============================================================================
 
+def _fmt(v):
+    """Quantize a catalog coordinate to 2 decimals for compact SVG output."""
+    return f"{v:.2f}"
+
+
+def _svg_inner(doc):
+    """Strip the <svg> wrapper from a serialized document, keeping the body."""
+    return doc[doc.index('>', doc.index('<svg')) + 1:doc.rindex('</svg>')]
+
+
+def _stream_catalog_svg(f, canvas_width, canvas_height, header_fragments, cell_docs):
+    """
+    Write the composite catalog SVG incrementally.
+
+    Streams the header chrome and each cell's pre-serialized body straight
+    to the file object, so memory stays constant regardless of catalog
+    size and no composite drawsvg tree is ever built. Fragments are
+    gathered into a local list and flushed with str.join in batches to
+    keep the number of write calls small without losing the memory bound.
+    """
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{canvas_width}" height="{canvas_height}" '
+        f'viewBox="0 0 {canvas_width} {canvas_height}">'
+    ]
+    parts.extend(header_fragments)
+    for cell_x, cell_y, doc in cell_docs:
+        parts.append(f'<g transform="translate({cell_x}, {cell_y})">{_svg_inner(doc)}</g>')
+        if len(parts) >= 64:
+            f.write(''.join(parts))
+            parts.clear()
+    parts.append('</svg>')
+    f.write(''.join(parts))
+
+
+def _rasterize_with_resvg(svg_path, png_path):
+    """
+    Rasterize an SVG file with the resvg CLI if it is installed.
+
+    resvg is a native rasterizer that handily beats the cairosvg pipeline
+    on large documents. Returns True on success, False when resvg is not
+    on PATH (callers then fall back to cairosvg).
+    """
+    resvg = shutil.which('resvg')
+    if not resvg:
+        return False
+    subprocess.run([resvg, svg_path, png_path], check=True,
+                   capture_output=True)
+    return True
+
+
+def _rasterize_svg(args):
+    """Rasterize one SVG document to PNG bytes (process pool worker)."""
+    svg_doc, width, height = args
+    import cairosvg
+    return cairosvg.svg2png(bytestring=svg_doc.encode('utf-8'),
+                            output_width=width, output_height=height)
+
+
+def _save_catalog_png_parallel(cell_docs, title_doc, canvas_width, canvas_height,
+                               cell_width, cell_height, output_path):
+    """
+    Rasterize the catalog cells in parallel and composite with Pillow.
+
+    CairoSVG renders a document single-threaded; rasterizing each cell as
+    its own small document spreads the work across all cores.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from PIL import Image
+
+    jobs = [(doc, cell_width, cell_height) for _, _, doc in cell_docs]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        rendered = list(executor.map(_rasterize_svg, jobs))
+
+    canvas = Image.new('RGBA', (int(canvas_width), int(canvas_height)), '#f5f5f5')
+
+    # Title strip across the top, then each cell at its grid position
+    title_png = _rasterize_svg((title_doc, int(canvas_width), 60))
+    title_img = Image.open(io.BytesIO(title_png)).convert('RGBA')
+    canvas.paste(title_img, (0, 0), title_img)
+
+    for (cell_x, cell_y, _), png_bytes in zip(cell_docs, rendered):
+        cell_img = Image.open(io.BytesIO(png_bytes)).convert('RGBA')
+        canvas.paste(cell_img, (int(cell_x), int(cell_y)), cell_img)
+
+    canvas.convert('RGB').save(output_path)
+
+
 def generate_shape_catalog(
     output_path: str = None,
     cell_width: int = 200,
@@ -492,12 +650,14 @@ def generate_shape_catalog(
     columns: int = 4,
     shape_height: int = 80,
     padding: int = 20,
-    font_size: int = 14
+    font_size: int = 14,
+    emit_svg: bool = True,
+    emit_png: bool = True
 ):
     """
     Generate a grid visualization of all shapes with labels.
     Useful for testing and documentation.
-    
+
     Args:
         output_path: Path to save the output files (SVG and PNG)
         cell_width: Width of each grid cell
@@ -506,7 +666,9 @@ def generate_shape_catalog(
         shape_height: Height to render each shape
         padding: Padding inside each cell
         font_size: Font size for labels
-        
+        emit_svg: Write the SVG file next to the PNG
+        emit_png: Write the rasterized PNG file
+
     Returns:
         str: Path to the generated PNG file
     """
@@ -518,129 +680,151 @@ def generate_shape_catalog(
     canvas_width = columns * cell_width
     canvas_height = rows * cell_height + 60  # Extra space for title
     
-    # Create drawing
-    d = draw.Drawing(canvas_width, canvas_height, origin=(0, 0))
-    d.append(draw.Rectangle(0, 0, canvas_width, canvas_height, fill='#f5f5f5'))
-    
-    # Add title
-    d.append(draw.Text(
-        f"Shape Catalog ({num_shapes} shapes)",
-        24, canvas_width/2, 35,
-        text_anchor='middle',
-        font_family='sans-serif',
-        font_weight='bold',
-        fill='#333'
-    ))
-    
-    # Draw grid of shapes
-    for idx, shape_name in enumerate(shapes):
-        row = idx // columns
-        col = idx % columns
-        
-        # Cell position
-        cell_x = col * cell_width
-        cell_y = row * cell_height + 60  # Offset for title
-        
-        # Draw cell background
-        d.append(draw.Rectangle(
-            cell_x + 2, cell_y + 2,
-            cell_width - 4, cell_height - 4,
-            fill='white',
-            stroke='#ddd',
-            stroke_width=1,
-            rx=5, ry=5
-        ))
-        
-        # Add centerlines for alignment reference
-        # Vertical centerline
-        center_x = cell_x + cell_width / 2
-        shape_area_height = cell_height - 30  # Reserve space for label
-        d.append(draw.Line(
-            center_x, cell_y + 2,
-            center_x, cell_y + shape_area_height,
-            stroke='#e0e0e0',
-            stroke_width=1,
-            stroke_dasharray='3,3'
-        ))
-        # Horizontal centerline
-        center_y = cell_y + shape_area_height / 2
-        d.append(draw.Line(
-            cell_x + 2, center_y,
-            cell_x + cell_width - 2, center_y,
-            stroke='#e0e0e0',
-            stroke_width=1,
-            stroke_dasharray='3,3'
-        ))
-        
-        # Get shape dimensions
-        width_ratio = SHAPE_WIDTH_RATIOS.get(shape_name, 2.5)
-        shape_width = shape_height * width_ratio
-        
-        # Scale down if shape is too wide for cell
-        max_shape_width = cell_width - 2 * padding
-        if shape_width > max_shape_width:
-            scale = max_shape_width / shape_width
-            actual_height = shape_height * scale
-        else:
-            scale = 1.0
-            actual_height = shape_height
-        
-        actual_width = actual_height * width_ratio
-        
-        # Center shape in cell (leave room for label at bottom)
-        shape_area_height = cell_height - 30  # Reserve space for label
-        offset_x = cell_x + (cell_width - actual_width) / 2
-        offset_y = cell_y + (shape_area_height - actual_height) / 2
-        
-        # Create and add shape
-        group = draw.Group(transform=f'translate({offset_x}, {offset_y})')
+    # Cell chrome (background, centerlines, labels) is emitted as raw SVG
+    # fragments rather than drawsvg elements - only the shape bodies go
+    # through drawsvg object construction.
+    title_fragment = (
+        f'<text x="{_fmt(canvas_width/2)}" y="35" font-size="24" text-anchor="middle" '
+        f'font-family="sans-serif" font-weight="bold" fill="#333">'
+        f'Shape Catalog ({num_shapes} shapes)</text>'
+    )
+    header_fragments = [
+        f'<rect x="0" y="0" width="{canvas_width}" height="{canvas_height}" fill="#f5f5f5" />',
+        title_fragment,
+    ]
+    cell_docs = []  # (cell_x, cell_y, standalone cell SVG), shared by SVG + PNG export
+
+    # Grid geometry invariants, hoisted out of the per-cell loop
+    shape_area_height = cell_height - 30  # Reserve space for label
+    max_shape_width = cell_width - 2 * padding
+    half_cell_w = cell_width / 2
+    half_area_h = shape_area_height / 2
+    label_y_offset = cell_height - 10
+
+    # Plan every cell up front: position, scaled shape size, offsets
+    # NumPy ships with the pandas dependency; only the catalog needs it
+    import numpy as np
+
+    idx = np.arange(num_shapes)
+    cell_xs = (idx % columns) * cell_width
+    cell_ys = (idx // columns) * cell_height + 60  # Offset for title
+
+    # Scale down shapes too wide for their cell, then center them in the
+    # shape area (leaving room for the label at the bottom)
+    ratios = np.array([SHAPE_WIDTH_RATIOS.get(s, 2.5) for s in shapes])
+    scale = np.minimum(1.0, max_shape_width / (shape_height * ratios))
+    actual_hs = shape_height * scale
+    actual_ws = actual_hs * ratios
+    offset_xs = cell_xs + (cell_width - actual_ws) / 2
+    offset_ys = cell_ys + (shape_area_height - actual_hs) / 2
+
+    cell_plan = list(zip(shapes, cell_xs.tolist(), cell_ys.tolist(),
+                         actual_hs.tolist(), offset_xs.tolist(), offset_ys.tolist()))
+
+    # Draw grid of shapes. Fragments are built relative to the cell
+    # origin: each cell is serialized once as a standalone document,
+    # reused by the parallel PNG export and translated into place when
+    # the composite SVG is streamed out.
+    for shape_name, cell_x, cell_y, actual_height, offset_x, offset_y in cell_plan:
+        cell_chrome = [
+            # Cell background
+            f'<rect x="2" y="2" width="{cell_width - 4}" height="{cell_height - 4}" '
+            f'rx="5" ry="5" fill="white" stroke="#ddd" stroke-width="1" />',
+            # Centerlines for alignment reference
+            f'<line x1="{_fmt(half_cell_w)}" y1="2" x2="{_fmt(half_cell_w)}" y2="{shape_area_height}" '
+            f'stroke="#e0e0e0" stroke-width="1" stroke-dasharray="3,3" />',
+            f'<line x1="2" y1="{_fmt(half_area_h)}" x2="{cell_width - 2}" y2="{_fmt(half_area_h)}" '
+            f'stroke="#e0e0e0" stroke-width="1" stroke-dasharray="3,3" />',
+        ]
+
+        # Create the shape, positioned relative to the cell origin
+        group = draw.Group(transform=f'translate({_fmt(offset_x - cell_x)}, {_fmt(offset_y - cell_y)})')
         try:
             shape = SHAPE_MENU[shape_name](actual_height)
             group.append(shape)
-            d.append(group)
         except Exception as e:
             # Draw error placeholder
-            d.append(draw.Text(
-                "ERROR",
-                12, cell_x + cell_width/2, cell_y + shape_area_height/2,
-                text_anchor='middle',
-                fill='red'
-            ))
-            print(f"Error drawing {shape_name}: {e}")
-        
+            group = None
+            cell_chrome.append(
+                f'<text x="{_fmt(half_cell_w)}" y="{_fmt(half_area_h)}" '
+                f'font-size="12" text-anchor="middle" fill="red">ERROR</text>'
+            )
+            logger.warning("Error drawing %s: %s", shape_name, e)
+
         # Add label
-        d.append(draw.Text(
-            shape_name,
-            font_size,
-            cell_x + cell_width/2,
-            cell_y + cell_height - 10,
-            text_anchor='middle',
-            font_family='monospace',
-            fill='#555'
-        ))
-    
+        cell_chrome.append(
+            f'<text x="{_fmt(half_cell_w)}" y="{label_y_offset}" '
+            f'font-size="{font_size}" text-anchor="middle" font-family="monospace" '
+            f'fill="#555">{shape_name}</text>'
+        )
+
+        # Standalone cell document: chrome behind, shape on top
+        cell_doc = draw.Drawing(cell_width, cell_height, origin=(0, 0))
+        cell_doc.append(draw.Raw(''.join(cell_chrome)))
+        if group is not None:
+            cell_doc.append(group)
+        cell_docs.append((cell_x, cell_y, cell_doc.as_svg()))
+
     # Default output path
     if output_path is None:
         output_dir = Path(__file__).parent.parent / 'output'
         output_dir.mkdir(exist_ok=True)
         output_path = str(output_dir / 'shape_catalog.png')
     
-    # Save SVG
-    svg_path = str(Path(output_path).with_suffix('.svg'))
-    try:
-        d.save_svg(svg_path)
-        print(f"Generated SVG catalog: {svg_path}")
-    except Exception as e:
-        print(f"Error saving SVG: {e}")
-    
-    # Save PNG
-    try:
-        d.save_png(output_path)
-        print(f"Generated PNG catalog: {output_path}")
-    except Exception as e:
-        print(f"Error converting to PNG: {e}")
-        print("Note: Install 'cairosvg' for PNG export: pip install cairosvg")
-    
+    # Save SVG - streamed straight to disk from the per-cell documents
+    if emit_svg:
+        svg_path = str(Path(output_path).with_suffix('.svg'))
+        try:
+            with open(svg_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                _stream_catalog_svg(f, canvas_width, canvas_height,
+                                    header_fragments, cell_docs)
+            logger.info("Generated SVG catalog: %s", svg_path)
+        except Exception as e:
+            logger.error("Error saving SVG: %s", e)
+
+    # Save PNG - prefer the native resvg CLI when installed, then
+    # rasterize the cells in parallel when Pillow is available (CairoSVG
+    # is single-threaded per document), otherwise render the whole
+    # composite in one go.
+    if emit_png:
+        try:
+            if emit_svg:
+                rasterized = _rasterize_with_resvg(svg_path, output_path)
+            else:
+                tmp_fd, tmp_svg = tempfile.mkstemp(suffix='.svg')
+                try:
+                    with os.fdopen(tmp_fd, 'w', encoding='utf-8') as f:
+                        _stream_catalog_svg(f, canvas_width, canvas_height,
+                                            header_fragments, cell_docs)
+                    rasterized = _rasterize_with_resvg(tmp_svg, output_path)
+                finally:
+                    os.unlink(tmp_svg)
+            if rasterized:
+                logger.info("Generated PNG catalog via resvg: %s", output_path)
+                return output_path
+        except Exception as e:
+            logger.warning("resvg rasterization failed, falling back to cairosvg: %s", e)
+
+        try:
+            title_doc = draw.Drawing(canvas_width, 60, origin=(0, 0))
+            title_doc.append(draw.Raw(title_fragment))
+            _save_catalog_png_parallel(cell_docs, title_doc.as_svg(),
+                                       canvas_width, canvas_height,
+                                       cell_width, cell_height, output_path)
+            logger.info("Generated PNG catalog: %s", output_path)
+        except Exception:
+            try:
+                import cairosvg
+                buf = io.StringIO()
+                _stream_catalog_svg(buf, canvas_width, canvas_height,
+                                    header_fragments, cell_docs)
+                cairosvg.svg2png(bytestring=buf.getvalue().encode('utf-8'),
+                                 write_to=output_path)
+                logger.info("Generated PNG catalog: %s", output_path)
+            except Exception as e:
+                logger.error("Error converting to PNG: %s", e)
+                logger.error("Note: Install 'cairosvg' for PNG export: pip install cairosvg")
+
     return output_path
 
 
@@ -660,6 +844,8 @@ if __name__ == "__main__":
                         help="List all available shapes")
     parser.add_argument("--columns", type=int, default=4,
                         help="Number of columns in catalog grid (default: 4)")
+    parser.add_argument("--svg", action="store_true",
+                        help="Also write the catalog SVG next to the PNG")
     
     args = parser.parse_args()
     
@@ -669,6 +855,7 @@ if __name__ == "__main__":
             ratio = SHAPE_WIDTH_RATIOS.get(name, 2.5)
             print(f"  - {name} (width ratio: {ratio:.2f})")
     elif args.catalog:
-        generate_shape_catalog(output_path=args.output, columns=args.columns)
+        generate_shape_catalog(output_path=args.output, columns=args.columns,
+                               emit_svg=args.svg)
     else:
         parser.print_help()
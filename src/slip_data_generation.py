@@ -4,17 +4,19 @@ Generates all data needed for receipt printing including figurine images,
 titles, and personalized content.
 """
 
+import atexit
+import csv
 import logging
 import os
-import csv
 import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any
 
-from content_generation import generate_content_with_gemini
-from generate_figurine import generate_figurine
-from data_service import DataService, get_prevalent_mindset
+from data_service import DataService, prevalent_mindset_from_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +25,90 @@ load_dotenv()
 # Path to fallback CSV data
 FALLBACK_CSV_PATH = Path(__file__).parent.parent / 'assets' / 'slip_content_fallback.csv'
 
+# Fallback rows keyed by mindset, loaded lazily on first use so offline
+# receipts don't re-read and re-scan the CSV on every print
+_FALLBACK_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+_FALLBACK_ORDER: list = []
+
+_FALLBACK_FIELDS = (
+    'data_id',
+    'title',
+    'paragraph1',
+    'paragraph2',
+    'resource_tools_inspiration',
+    'resource_anlaufstellen',
+    'resource_programm',
+)
+
+
+def _load_fallback_cache() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Load the fallback CSV once and index its rows by mindset."""
+    global _FALLBACK_CACHE
+    if _FALLBACK_CACHE is not None:
+        return _FALLBACK_CACHE
+
+    if not FALLBACK_CSV_PATH.exists():
+        logger.error("[FALLBACK] CSV file not found: %s", FALLBACK_CSV_PATH)
+        return None
+
+    try:
+        # csv.DictReader on purpose: the shipped CSV is ragged (stray
+        # commas widen the resource columns past the header), which
+        # DictReader tolerates but pandas' C tokenizer misaligns
+        cache: Dict[str, Dict[str, Any]] = {}
+        with open(FALLBACK_CSV_PATH, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                mindset_key = (row.get('mindset') or '').strip()
+                if not mindset_key or mindset_key in cache:
+                    continue
+                cache[mindset_key] = {k: row.get(k, '') for k in _FALLBACK_FIELDS}
+                _FALLBACK_ORDER.append(mindset_key)
+        _FALLBACK_CACHE = cache
+        logger.info("[FALLBACK] Cached fallback data for %d mindsets", len(cache))
+    except Exception as e:
+        logger.error("[FALLBACK] Error loading fallback CSV: %s", e)
+        return None
+
+    return _FALLBACK_CACHE
+
+
+# Flattens the two-line title for single-line log output
+_NL_TRANS = str.maketrans('\n', ' ')
+
+# Resource recommendation sections: (slip_data key, DataService kategorie)
+_RESOURCE_CATEGORIES = (
+    ('tool', "Tools & Inspiration"),
+    ('location', "Anlaufstellen & Angebote"),
+    ('program', "Programm-Empfehlung"),
+)
+
+# Shared pool for the slip pipeline (connectivity probe + the parallel
+# figurine/content/resource dispatch); kept process-wide so worker
+# threads stay warm instead of being spawned per receipt
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='slip-data')
+atexit.register(_EXECUTOR.shutdown, wait=False)
+
+# Connectivity probe result with a short TTL, so the slip pipeline isn't
+# serialized behind a fresh TCP round-trip on every receipt
+_NET_TTL = 15.0
+_net_state = {'ok': None, 'ts': 0.0}
+
 
 def check_internet_connection() -> bool:
-    """Check if internet connection is available."""
+    """Check if internet connection is available (cached for a few seconds)."""
+    now = time.monotonic()
+    if _net_state['ok'] is not None and now - _net_state['ts'] < _NET_TTL:
+        return _net_state['ok']
+
     try:
-        socket.create_connection(("8.8.8.8", 53), timeout=3)
-        return True
+        socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+        ok = True
     except OSError:
-        return False
+        ok = False
+
+    _net_state['ok'] = ok
+    _net_state['ts'] = now
+    return ok
 
 
 def load_fallback_data_by_mindset(mindset: Optional[str]) -> Optional[Dict[str, Any]]:
@@ -43,47 +121,23 @@ def load_fallback_data_by_mindset(mindset: Optional[str]) -> Optional[Dict[str,
     Returns:
         Dictionary with fallback content or None if not found
     """
-    if not FALLBACK_CSV_PATH.exists():
-        logger.error(f"[FALLBACK] CSV file not found: {FALLBACK_CSV_PATH}")
+    cache = _load_fallback_cache()
+    if not cache:
         return None
-    
+
     # Default to Explorer if no mindset provided
     target_mindset = mindset if mindset else 'Explorer'
-    
-    try:
-        with open(FALLBACK_CSV_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('mindset', '').strip() == target_mindset:
-                    logger.info(f"[FALLBACK] Found fallback data for mindset: {target_mindset}")
-                    return {
-                        'data_id': row.get('data_id', ''),
-                        'title': row.get('title', ''),
-                        'paragraph1': row.get('paragraph1', ''),
-                        'paragraph2': row.get('paragraph2', ''),
-                        'resource_tools_inspiration': row.get('resource_tools_inspiration', ''),
-                        'resource_anlaufstellen': row.get('resource_anlaufstellen', ''),
-                        'resource_programm': row.get('resource_programm', '')
-                    }
-        
-        # If target mindset not found, fall back to first row (Explorer)
-        logger.warning(f"[FALLBACK] Mindset '{target_mindset}' not found, using first available")
-        with open(FALLBACK_CSV_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            row = next(reader, None)
-            if row:
-                return {
-                    'data_id': row.get('data_id', ''),
-                    'title': row.get('title', ''),
-                    'paragraph1': row.get('paragraph1', ''),
-                    'paragraph2': row.get('paragraph2', ''),
-                    'resource_tools_inspiration': row.get('resource_tools_inspiration', ''),
-                    'resource_anlaufstellen': row.get('resource_anlaufstellen', ''),
-                    'resource_programm': row.get('resource_programm', '')
-                }
-    except Exception as e:
-        logger.error(f"[FALLBACK] Error loading fallback CSV: {e}")
-    
+
+    row = cache.get(target_mindset)
+    if row is not None:
+        logger.info("[FALLBACK] Found fallback data for mindset: %s", target_mindset)
+        return dict(row)
+
+    # If target mindset not found, fall back to first row (Explorer)
+    logger.warning("[FALLBACK] Mindset '%s' not found, using first available", target_mindset)
+    if _FALLBACK_ORDER:
+        return dict(cache[_FALLBACK_ORDER[0]])
+
     return None
 
 def generate_slip_data(
@@ -114,23 +168,33 @@ def generate_slip_data(
         - offline_mode: bool (True if using fallback data)
         - data_id: str (from fallback CSV when offline)
     """
-    logger.info(f"[DATA_GEN] Generating slip data for #{figurine_id}")
-    
-    # Extract SVG list and mindset from answers first (needed for both modes)
+    logger.info("[DATA_GEN] Generating slip data for #%s", figurine_id)
+
+    # Fire the connectivity probe first; extracting SVGs and the mindset
+    # below runs while it is in flight, hiding the probe's latency
+    net_future = _EXECUTOR.submit(check_internet_connection)
+
+    # Extract SVG list and mindset from answers first (needed for both
+    # modes); SVG names and mindset tokens come out of a single pass
     svg_list = []
     mindset = None
-    
+
     if answers:
+        mindset_tokens = []
         for ans in answers:
             svg_val = ans.get('svg')
             if svg_val and isinstance(svg_val, str):
                 svg_list.append(svg_val)
-        
-        mindset = get_prevalent_mindset(answers)
-        logger.info(f"[DATA_GEN] Prevalent Mindset: {mindset}")
-    
+
+            m_str = ans.get('Mindsets')
+            if m_str and isinstance(m_str, str):
+                mindset_tokens.extend(m.strip() for m in m_str.split(','))
+
+        mindset = prevalent_mindset_from_tokens(mindset_tokens)
+        logger.info("[DATA_GEN] Prevalent Mindset: %s", mindset)
+
     # Check internet connection
-    has_internet = check_internet_connection()
+    has_internet = net_future.result()
     
     if not has_internet:
         logger.warning("[DATA_GEN] No internet connection - using offline fallback mode")
@@ -149,32 +213,46 @@ def generate_slip_data(
     # Generate title text
     title_text = _generate_title(data_service, mindset)
     slip_data['title_text'] = title_text
-    
-    # Generate figurine image
-    figurine_path = _generate_figurine_image(
-        svg_list,
-        figurine_id,
-        title_text
+
+    # Imported here so the Gemini client stack is only paid for on the
+    # online path (offline mode and CLI tools never need it)
+    from content_generation import generate_content_with_gemini
+
+    # Figurine rendering, Gemini content and resource lookups are
+    # independent once the title is known: figurine generation is Cairo +
+    # file I/O, Gemini is network-bound and resources are pandas-bound,
+    # so running them on the shared pool overlaps well
+    figurine_future = _EXECUTOR.submit(
+        _generate_figurine_image, svg_list, figurine_id, title_text
     )
-    slip_data['figurine_path'] = figurine_path
-    
-    # Generate personalized content with AI
-    content = generate_content_with_gemini(
+    content_future = _EXECUTOR.submit(
+        generate_content_with_gemini,
         answers,
         data_service=data_service,
         figurine_id=figurine_id,
         model_name=model_name
     )
-    slip_data['content'] = content
-    
-    # Generate resource recommendations
-    resources = _generate_resource_recommendations(data_service, answers)
-    slip_data['resources'] = resources
-    
-    logger.info(f"[DATA_GEN] Slip data generation complete for #{figurine_id}")
+    resources_future = _EXECUTOR.submit(
+        _generate_resource_recommendations, data_service, answers
+    )
+
+    slip_data['figurine_path'] = _future_result(figurine_future, 'Figurine generation', None)
+    slip_data['content'] = _future_result(content_future, 'Content generation', {})
+    slip_data['resources'] = _future_result(resources_future, 'Resource lookup', {})
+
+    logger.info("[DATA_GEN] Slip data generation complete for #%s", figurine_id)
     return slip_data
 
 
+def _future_result(future, label: str, default):
+    """Await a future, logging failures so one task can't sink the others."""
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error("[DATA_GEN] %s failed: %s", label, e)
+        return default
+
+
 def _generate_offline_slip_data(
     figurine_id: int,
     mindset: Optional[str],
@@ -193,7 +271,7 @@ def _generate_offline_slip_data(
     Returns:
         Dictionary containing slip data from fallback CSV
     """
-    logger.info(f"[OFFLINE] Generating offline slip data for #{figurine_id} with mindset: {mindset}")
+    logger.info("[OFFLINE] Generating offline slip data for #%s with mindset: %s", figurine_id, mindset)
     
     # Load fallback data from CSV based on mindset
     fallback = load_fallback_data_by_mindset(mindset)
@@ -248,7 +326,7 @@ def _generate_offline_slip_data(
     )
     slip_data['figurine_path'] = figurine_path
     
-    logger.info(f"[OFFLINE] Slip data generated with data_id: {data_id}")
+    logger.info("[OFFLINE] Slip data generated with data_id: %s", data_id)
     return slip_data
 
 
@@ -264,7 +342,8 @@ def _generate_title(data_service: Optional[DataService], mindset: Optional[str])
     
     if word1 and word2 and word1 != "Unknown" and word2 != "Unknown":
         title_text = f"{word1}\n{word2}"
-        logger.info(f"[DATA_GEN] Generated Title: {title_text.replace(chr(10), ' ')}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[DATA_GEN] Generated Title: %s", title_text.translate(_NL_TRANS))
         return title_text
     
     return None
@@ -276,6 +355,10 @@ def _generate_figurine_image(
     title_text: Optional[str]
 ) -> Optional[str]:
     """Generate the figurine image and return its path."""
+    # Deferred: pulls in drawsvg/cairosvg, which short-lived callers of
+    # this module shouldn't pay for at import time
+    from generate_figurine import generate_figurine
+
     figurine_output_dir = os.getenv('FIGURINE_OUTPUT_DIR')
     if not figurine_output_dir:
         figurine_output_dir = str(Path(__file__).parent.parent / 'output')
@@ -287,7 +370,7 @@ def _generate_figurine_image(
         figurine_id=figurine_id
     )
     
-    logger.info(f"[DATA_GEN] Figurine image generated: {figurine_path}")
+    logger.info("[DATA_GEN] Figurine image generated: %s", figurine_path)
     return figurine_path
 
 
@@ -309,18 +392,15 @@ def _generate_resource_recommendations(
             'program_link': None
         }
     
-    categories = {
-        'tool': "Tools & Inspiration",
-        'location': "Anlaufstellen & Angebote",
-        'program': "Programm-Empfehlung"
-    }
-    
+    # One batched lookup: answer features are scored once for all categories
+    best_by_category = data_service.find_best_resources(
+        kategorien=[category for _, category in _RESOURCE_CATEGORIES],
+        answers=answers
+    )
+
     resources = {}
-    for key, category in categories.items():
-        resource_recommendation = data_service.find_best_resource(
-            kategorie=category,
-            answers=answers
-        )
+    for key, category in _RESOURCE_CATEGORIES:
+        resource_recommendation = best_by_category.get(category) or {}
         resources[key] = resource_recommendation.get('Item', f'No {category} available')
         # Also get the link if it exists in the resource data
         link = resource_recommendation.get('Link') or resource_recommendation.get('link')
@@ -329,6 +409,6 @@ def _generate_resource_recommendations(
             resources[f'{key}_link'] = link.strip()
         else:
             resources[f'{key}_link'] = None
-        logger.info(f"[DATA_GEN] {category}: {resources[key][:50]}... (link: {resources.get(f'{key}_link', 'None')})")
+        logger.info("[DATA_GEN] %s: %.50s... (link: %s)", category, resources[key], resources.get(f'{key}_link'))
     
     return resources
@@ -3,11 +3,14 @@ Slip Printing Module
 Handles the physical printing of receipts using pre-generated data.
 """
 
+import functools
 import logging
 import os
 import textwrap
-from typing import Dict, Any
-from PIL import Image
+from typing import Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -15,52 +18,124 @@ logger = logging.getLogger(__name__)
 PAPER_WIDTH_PX = 512
 CHAR_WIDTH = 42  # Approximate characters per line for standard font
 
-def print_scaled_image(image_path: str, printer) -> Image.Image:
-    """
-    Load and resize image to fit paper width.
-    Maintains aspect ratio without cropping height.
-    """
-    img = Image.open(image_path).convert('RGB')
-    
+# Receipt resource sections: (slip_data key, printed label)
+RESOURCE_CATEGORIES = (
+    ('tool', "Tools & Inspiration"),
+    ('location', "Anlaufstellen & Angebote"),
+    ('program', "Programm-Empfehlung"),
+)
+
+# Shared wrapper: textwrap.fill() builds a fresh TextWrapper (and its
+# regexes) per call, so reuse one instance for every receipt line
+_WRAPPER = textwrap.TextWrapper(width=CHAR_WIDTH, break_long_words=False,
+                                break_on_hyphens=False)
+
+@functools.lru_cache(maxsize=32)
+def _load_scaled_image(image_path: str, mtime: float) -> 'Image.Image':
+    """Load and LANCZOS-resize an image, cached by path and mtime."""
+    # Imported lazily so importing this module stays cheap for callers
+    # that never print an image
+    from PIL import Image
+
+    img = Image.open(image_path)
+
+    # Figurines are generated locally as RGB PNGs; converting an image
+    # that's already RGB is a full-frame copy for nothing
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
     # Resize to paper width while maintaining aspect ratio
     if img.width != PAPER_WIDTH_PX:
         ratio = PAPER_WIDTH_PX / float(img.width)
         new_height = int(float(img.height) * ratio)
         img = img.resize((PAPER_WIDTH_PX, new_height), Image.Resampling.LANCZOS)
+
+    return img
+
+
+# Encoded ESC/POS raster bytes keyed by (path, mtime); bounded FIFO
+_RASTER_CACHE: Dict[tuple, bytes] = {}
+_RASTER_CACHE_MAX = 16
+
+
+def print_scaled_image(image_path: str, printer) -> 'Image.Image':
+    """
+    Load and resize image to fit paper width.
+    Maintains aspect ratio without cropping height.
+
+    The decoded and resized image is cached keyed by (path, mtime), and so
+    is the final ESC/POS raster byte stream: reprints of the same figurine
+    skip the decode, the LANCZOS resample and python-escpos' per-pixel
+    dithering/bit-packing, replaying the captured bytes instead.
+    """
+    key = (image_path, os.path.getmtime(image_path))
+
+    # The byte capture hooks escpos' private _raw; printers that don't
+    # expose it (e.g. FilePrinter) just take the resize cache
+    original_raw = getattr(printer, '_raw', None)
+    if original_raw is None:
+        printer.image(_load_scaled_image(*key))
+        return
+
+    cached = _RASTER_CACHE.get(key)
+    if cached is not None:
+        printer._raw(cached)
+        return
+
+    img = _load_scaled_image(*key)
+
+    # Capture the raw bytes the escpos image encoder emits while still
+    # forwarding them to the device, then replay them on reprints
+    captured = bytearray()
+
+    def _capturing_raw(data):
+        captured.extend(data)
+        original_raw(data)
+
+    printer._raw = _capturing_raw
+    try:
+        printer.image(img)
+    finally:
+        printer._raw = original_raw
+
+    if len(_RASTER_CACHE) >= _RASTER_CACHE_MAX:
+        _RASTER_CACHE.pop(next(iter(_RASTER_CACHE)))
+    _RASTER_CACHE[key] = bytes(captured)
     
-    printer.image(img)
-    
+@functools.lru_cache(maxsize=64)
+def _qr_image(url: str) -> 'Image.Image':
+    """
+    Render a QR code bitmap once per URL.
+
+    printer.qr() redoes the Reed-Solomon encoding and matrix build on
+    every call; reprints of the same figurine reuse the cached bitmap.
+    The qrcode package ships with python-escpos.
+    """
+    import qrcode
+    q = qrcode.QRCode(box_size=6, border=2)
+    q.add_data(url)
+    q.make()
+    return q.make_image().convert('RGB')
+
+
 def print_labeled_section(printer, label: str, text: str):
     """Print a section with a bold label followed by normal text."""
     printer.set(align='left', bold=True)
     printer.text(f"{label} ")
     printer.set(bold=False)
-    
-    # First line includes label, subsequent lines are full width
-    words = text.split()
-    first_line = []
-    remaining_words = []
-    first_line_width = CHAR_WIDTH - len(label) - 1
-    
-    # Build first line
-    current_length = 0
-    for i, word in enumerate(words):
-        test_length = current_length + len(word) + (1 if current_length > 0 else 0)
-        if test_length <= first_line_width:
-            first_line.append(word)
-            current_length = test_length
-        else:
-            remaining_words = words[i:]
-            break
-    
-    # Print first line (already on same line as label)
-    printer.textln(' '.join(first_line))
-    
-    # Print remaining lines with full width
-    if remaining_words:
-        remaining_text = ' '.join(remaining_words)
-        wrapped = textwrap.fill(remaining_text, width=CHAR_WIDTH)
-        printer.textln(wrapped)
+
+    # Wrap label and text together so the first line accounts for the
+    # label width, then strip the label back off - textwrap does the word
+    # packing in one pass instead of a hand-rolled accumulator loop
+    pad = f"{label} "
+    lines = _WRAPPER.wrap(pad + text)
+
+    # First line (already on same line as label)
+    printer.textln(lines[0][len(pad):] if lines else '')
+
+    # Remaining lines with full width
+    for line in lines[1:]:
+        printer.textln(line)
 
 
 def create_full_receipt(printer, slip_data: Dict[str, Any]):
@@ -72,7 +147,7 @@ def create_full_receipt(printer, slip_data: Dict[str, Any]):
         slip_data: Dictionary containing all generated data from slip_data_generation
     """
     figurine_id = slip_data.get('figurine_id', 0)
-    logger.info(f"[PRINT] Printing receipt for #{figurine_id}")
+    logger.info("[PRINT] Printing receipt for #%s", figurine_id)
     
     figurine_path = slip_data.get('figurine_path')
     content = slip_data.get('content', {})
@@ -81,8 +156,13 @@ def create_full_receipt(printer, slip_data: Dict[str, Any]):
     qr_url = slip_data.get('qr_url', f"https://figurati.ch/${figurine_id}")
     
     # === HEADER: Image ===
-    if figurine_path and os.path.exists(figurine_path):
-        print_scaled_image(figurine_path, printer)
+    # A non-None path came from the generator, so trust it rather than
+    # stat()ing first; a vanished file surfaces as OSError below
+    if figurine_path:
+        try:
+            print_scaled_image(figurine_path, printer)
+        except OSError as e:
+            logger.warning("[PRINT] Figurine image unavailable: %s", e)
     printer.ln()
     
     # Figurine number
@@ -96,31 +176,27 @@ def create_full_receipt(printer, slip_data: Dict[str, Any]):
     
     # Body paragraphs - two personalized paragraphs from Ollama
     if content.get('paragraph1'):
-        wrapped = textwrap.fill(content['paragraph1'], width=CHAR_WIDTH)
-        printer.textln(wrapped)
+        printer.textln(_WRAPPER.fill(content['paragraph1']))
         printer.ln()
-    
+
     if content.get('paragraph2'):
-        wrapped = textwrap.fill(content['paragraph2'], width=CHAR_WIDTH)
-        printer.textln(wrapped)
+        printer.textln(_WRAPPER.fill(content['paragraph2']))
         printer.ln()
     
     # Labeled sections (bold labels)
-    categories = {
-        'tool': "Tools & Inspiration",
-        'location': "Anlaufstellen & Angebote",
-        'program': "Programm-Empfehlung"
-    }
-    
-    for key, label in categories.items():
+    for key, label in RESOURCE_CATEGORIES:
         resource_text = resources.get(key, f'No {label} available')
-        print_labeled_section(printer, f"{label}:", resource_text)    
+        print_labeled_section(printer, f"{label}:", resource_text)
         printer.ln()
     
     
     # === QR CODE ===
     printer.set(align='center')
-    printer.qr(qr_url, size=6)
+    try:
+        printer.image(_qr_image(qr_url))
+    except Exception as e:
+        logger.warning("[PRINT] Cached QR render failed, using printer.qr: %s", e)
+        printer.qr(qr_url, size=6)
     printer.ln()
     
     
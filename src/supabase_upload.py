@@ -2,175 +2,321 @@
 Supabase Upload Module
 Uploads slip data to Supabase database.
 Replaces the previous Google Sheets integration.
+
+The shared client is configured with a keep-alive httpx pool
+(max_keepalive_connections=5, max_connections=10, keepalive_expiry=30s)
+so consecutive inserts reuse the same TCP+TLS connection.
 """
 
+import atexit
+import functools
 import logging
-import uuid
+import threading
 import os
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from supabase import Client
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Supabase configuration
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY')  # Use service key for server-side uploads
 TABLE_NAME = 'slips'
 
 
+@functools.lru_cache(maxsize=1)
+def _config() -> SimpleNamespace:
+    """
+    Parse .env once and capture the Supabase settings.
+
+    load_dotenv re-reads the file on every call, so it is deferred to
+    first use and cached together with the resolved env values.
+    """
+    load_dotenv()
+    return SimpleNamespace(
+        url=os.environ.get('SUPABASE_URL'),
+        # Use service key for server-side uploads
+        service_key=os.environ.get('SUPABASE_SERVICE_KEY')
+    )
+
+
+# HTML escaping as a single C-level translate pass; html.escape chains
+# several .replace calls instead
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
 def format_resource_with_link(item: str, link: Optional[str]) -> str:
     """
     Format resource with link as HTML if link exists.
     The text before the first "." becomes the link text, rest is normal text.
-    
+    Item text and URL are HTML-escaped before being embedded.
+
     Example:
         item: "Lernwerkstatt. Ein Ort zum Experimentieren und Lernen."
         link: "https://example.com"
         result: '<a href="https://example.com">Lernwerkstatt</a>. Ein Ort zum Experimentieren und Lernen.'
-    
+
     Args:
         item: The resource item text
         link: Optional URL link for the resource
-        
+
     Returns:
         Formatted string (HTML if link exists, plain text otherwise)
     """
-    if not link or not isinstance(link, str) or link.strip() == '':
+    # isspace() covers the whitespace-only case without the .strip() copy
+    if not link or not isinstance(link, str) or link.isspace():
         return item
-    
-    # Find first period to split link text from rest
-    dot_index = item.find('.')
-    
-    if dot_index == -1:
+
+    link = link.translate(_HTML_ESCAPE)
+
+    # Split at the first period: the text before it becomes the link text
+    link_text, sep, rest_text = item.partition('.')
+
+    if not sep:
         # No period found, entire text becomes link
-        return f'<a href="{link}">{item}</a>'
-    
-    link_text = item[:dot_index]
-    rest_text = item[dot_index:]
-    
-    return f'<a href="{link}">{link_text}</a>{rest_text}'
+        return f'<a href="{link}">{item.translate(_HTML_ESCAPE)}</a>'
+
+    return (f'<a href="{link}">{link_text.translate(_HTML_ESCAPE)}</a>'
+            f'.{rest_text.translate(_HTML_ESCAPE)}')
+
 
+# Process-wide client: create_client spins up a fresh httpx session and
+# pays a new TLS handshake per call, so build it once and reuse the
+# keep-alive connection for every upload
+_client: Optional['Client'] = None
+_client_lock = threading.Lock()
 
-def get_supabase_client() -> Optional[Client]:
+
+def get_supabase_client() -> Optional['Client']:
     """
-    Create and return a Supabase client using service key credentials.
-    
+    Return the shared Supabase client, creating it on first use.
+
     The service key is used for server-side operations (insert/update/delete).
     This key should NEVER be exposed in client-side code.
-       
+
     Returns:
         Supabase Client or None if authentication fails
     """
+    global _client
+    if _client is not None:
+        return _client
+
     try:
-        if not SUPABASE_URL:
+        # Imported lazily: the supabase package (httpx, postgrest, etc.)
+        # costs hundreds of ms at import time, which offline runs and
+        # tools that never upload shouldn't pay.
+        from supabase import create_client
+
+        config = _config()
+
+        if not config.url:
             logger.error("SUPABASE_URL environment variable is not set")
             return None
-            
-        if not SUPABASE_SERVICE_KEY:
+
+        if not config.service_key:
             logger.error("SUPABASE_SERVICE_KEY environment variable is not set")
             return None
-        
-        client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-        logger.info("Successfully created Supabase client")
-        return client
-        
-    except Exception as e:
-        logger.error(f"Failed to create Supabase client: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+
+        # Double-checked under the lock: uploads may come from the printer
+        # thread and the main thread at the same time
+        with _client_lock:
+            if _client is None:
+                _client = create_client(config.url, config.service_key)
+                _configure_keepalive_pool(_client)
+                logger.info("Successfully created Supabase client")
+        return _client
+
+    except Exception:
+        logger.exception("Failed to create Supabase client")
         return None
 
 
+def _configure_keepalive_pool(client: 'Client') -> None:
+    """
+    Give the client's PostgREST session a keep-alive connection pool.
+
+    httpx's default transport is sized conservatively; swapping in
+    explicit limits keeps a handful of warm connections to Supabase so
+    back-to-back inserts skip the TLS handshake.
+    """
+    try:
+        import httpx
+
+        limits = httpx.Limits(
+            max_keepalive_connections=5,
+            max_connections=10,
+            keepalive_expiry=30.0
+        )
+        session = client.postgrest.session
+        session._transport = httpx.HTTPTransport(limits=limits, retries=1)
+    except Exception as e:
+        # Pool tuning is an optimization; the default transport still works
+        logger.warning("Could not configure keep-alive pool: %s", e)
+
+
+def _fast_uuid4() -> str:
+    """
+    Generate a canonical RFC 4122 v4 UUID string.
+
+    Equivalent to str(uuid.uuid4()) but skips the uuid.UUID object's
+    validation and formatting machinery: 16 random bytes, the
+    version/variant bits, and one hex+hyphen format.
+    """
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40
+    b[8] = (b[8] & 0x3F) | 0x80
+    h = b.hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+# Flattens the two-line title (and any stray \r) in one C-level pass
+_TITLE_TRANS = str.maketrans({'\n': ' ', '\r': ' '})
+
+# Maps slip_data resource keys to their slips-table columns
+_RESOURCE_KEYS = (
+    ('tool', 'resource_tools_inspiration'),
+    ('location', 'resource_anlaufstellen'),
+    ('program', 'resource_programm'),
+)
+
+
+def _build_record(slip_data: Dict[str, Any], data_id: str) -> Dict[str, Any]:
+    """Serialize slip data into a row for the slips table."""
+    figurine_id = slip_data.get('figurine_id', 0)
+    # Convert newline-separated title to single line with spaces
+    title_text = (slip_data.get('title_text') or '').translate(_TITLE_TRANS)
+
+    content = slip_data.get('content', {})
+    resources = slip_data.get('resources', {})
+
+    record = {
+        'data_id': data_id,
+        'figure_id': figurine_id,
+        'title': title_text,
+        'paragraph1': content.get('paragraph1', ''),
+        'paragraph2': content.get('paragraph2', '')
+    }
+
+    # Format resources with links if available
+    record.update({
+        column: format_resource_with_link(resources.get(key, ''),
+                                          resources.get(f'{key}_link'))
+        for key, column in _RESOURCE_KEYS
+    })
+
+    return record
+
+
+class SlipUploader:
+    """
+    Buffers slip records and inserts them in batches.
+
+    A batch insert is one HTTPS round-trip regardless of row count, so
+    queued records are flushed together once the buffer reaches
+    batch_limit (or when flush() is called explicitly after a slip).
+    """
+
+    def __init__(self, batch_limit: int = 50):
+        self.batch_limit = batch_limit
+        self._buffer: list = []
+        self._lock = threading.Lock()
+
+    def queue_slip(self, slip_data: Dict[str, Any]) -> str:
+        """Assign a data_id, buffer the record, and return the id."""
+        data_id = _fast_uuid4()
+        logger.info("[UPLOAD] Generated data_id: %s", data_id)
+
+        record = _build_record(slip_data, data_id)
+        with self._lock:
+            self._buffer.append(record)
+            should_flush = len(self._buffer) >= self.batch_limit
+        if should_flush:
+            self.flush()
+        return data_id
+
+    def flush(self) -> bool:
+        """
+        Insert all buffered records in one batch.
+
+        Returns:
+            True if the buffer was empty or the insert succeeded
+        """
+        with self._lock:
+            batch = self._buffer
+            self._buffer = []
+
+        if not batch:
+            return True
+
+        try:
+            client = get_supabase_client()
+            if not client:
+                logger.error("[UPLOAD] Could not get Supabase client")
+                return False
+
+            # return=minimal: we never read the echoed rows back, so skip
+            # the server-side serialization and response payload entirely.
+            # PostgREST raises on failure, so reaching the log means success.
+            client.table(TABLE_NAME).insert(batch, returning='minimal').execute()
+
+            logger.info("[UPLOAD] Successfully uploaded %d record(s)", len(batch))
+            return True
+
+        except Exception:
+            logger.exception("[UPLOAD] Failed to upload slip data")
+            return False
+
+
+# Shared uploader used by the module-level helpers
+_uploader = SlipUploader()
+
+# Background worker for the actual HTTP inserts; shut down with
+# wait=True so queued uploads complete before the process exits
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='supabase-upload')
+atexit.register(_executor.shutdown, wait=True)
+
+
 def upload_slip_data(slip_data: Dict[str, Any]) -> Optional[str]:
     """
-    Upload slip data to Supabase and return generated data_id.
-    
+    Queue slip data for upload and return the generated data_id.
+
+    The data_id is assigned client-side, so the QR code can be built
+    immediately; the HTTPS insert runs on a background thread and logs
+    its own failures.
+
     Args:
         slip_data: Dictionary containing:
             - figurine_id: int
             - title_text: str (two lines separated by newline)
             - content: dict with 'paragraph1', 'paragraph2'
             - resources: dict with 'tool', 'location', 'program' items and optional links
-            
+
     Returns:
-        Generated UUID (data_id) if successful, None otherwise
+        Generated UUID (data_id); None is no longer returned on upload
+        failure since the insert completes asynchronously
     """
-    # Generate unique data_id
-    data_id = str(uuid.uuid4())
-    logger.info(f"[UPLOAD] Generated data_id: {data_id}")
-    
-    try:
-        client = get_supabase_client()
-        if not client:
-            logger.error("[UPLOAD] Could not get Supabase client")
-            return None
-        
-        # Prepare row data
-        figurine_id = slip_data.get('figurine_id', 0)
-        title_text = slip_data.get('title_text', '')
-        if title_text:
-            # Convert newline-separated title to single line with space
-            title_text = title_text.replace('\n', ' ')
-        
-        content = slip_data.get('content', {})
-        resources = slip_data.get('resources', {})
-        
-        # Format resources with links if available
-        tool_item = resources.get('tool', '')
-        tool_link = resources.get('tool_link')
-        tool_formatted = format_resource_with_link(tool_item, tool_link)
-        
-        location_item = resources.get('location', '')
-        location_link = resources.get('location_link')
-        location_formatted = format_resource_with_link(location_item, location_link)
-        
-        program_item = resources.get('program', '')
-        program_link = resources.get('program_link')
-        program_formatted = format_resource_with_link(program_item, program_link)
-        
-        # Build the record to insert
-        record = {
-            'data_id': data_id,
-            'figure_id': figurine_id,
-            'title': title_text,
-            'paragraph1': content.get('paragraph1', ''),
-            'paragraph2': content.get('paragraph2', ''),
-            'resource_tools_inspiration': tool_formatted,
-            'resource_anlaufstellen': location_formatted,
-            'resource_programm': program_formatted
-        }
-        
-        # Insert into Supabase
-        result = client.table(TABLE_NAME).insert(record).execute()
-        
-        if result.data:
-            logger.info(f"[UPLOAD] Successfully uploaded data for figurine #{figurine_id} with data_id: {data_id}")
-            return data_id
-        else:
-            logger.error(f"[UPLOAD] Insert returned no data")
-            return None
-        
-    except Exception as e:
-        logger.error(f"[UPLOAD] Failed to upload slip data: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return None
+    data_id = _uploader.queue_slip(slip_data)
+    _executor.submit(_uploader.flush)
+    return data_id
+
+
+# Full URL template, hoisted so each call is a single .format pass
+_QR_TEMPLATE = ("https://museum-of-lifelong-learning.github.io/unfinished/"
+                "?data_id={}&figure_id={}")
 
 
 def build_qr_url(data_id: str, figure_id: int) -> str:
     """
     Build the QR code URL with data_id and figure_id parameters.
-    
+
     Args:
         data_id: The UUID for this slip data
         figure_id: The figurine ID
-        
+
     Returns:
         Full URL for the QR code
     """
-    base_url = "https://museum-of-lifelong-learning.github.io/unfinished/"
-    return f"{base_url}?data_id={data_id}&figure_id={figure_id}"
+    return _QR_TEMPLATE.format(data_id, figure_id)
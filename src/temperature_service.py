@@ -1,32 +1,73 @@
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Cached sysfs fds keyed by zone path. Thermal zone files stay valid and
+# seekable, so each poll is one lseek+read instead of an open/decode/close
+# round-trip with a fresh TextIOWrapper.
+_zone_fds = {}
+
+def _read_zone(zone_path: str) -> str:
+    """Read a thermal zone file through a cached file descriptor."""
+    fd = _zone_fds.get(zone_path)
+    if fd is None:
+        fd = os.open(zone_path, os.O_RDONLY)
+        _zone_fds[zone_path] = fd
+    try:
+        os.lseek(fd, 0, os.SEEK_SET)
+        return os.read(fd, 32).decode('ascii').strip()
+    except OSError:
+        # Stale fd (e.g. the zone re-enumerated): drop it and retry once
+        _zone_fds.pop(zone_path, None)
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+        fd = os.open(zone_path, os.O_RDONLY)
+        _zone_fds[zone_path] = fd
+        os.lseek(fd, 0, os.SEEK_SET)
+        return os.read(fd, 32).decode('ascii').strip()
+
 def get_temperature(zone_path: str, name: str) -> float:
     """Read temperature from a thermal zone."""
     try:
-        with open(zone_path, "r") as f:
-            raw = f.read().strip()
-        value = float(raw)
-        temp_c = value / 1000.0 if value > 200 else value
+        raw = _read_zone(zone_path)
+        # sysfs reports integer millidegrees; int() is the fast path
+        try:
+            value = int(raw)
+        except ValueError:
+            value = float(raw)
+        temp_c = value / 1000.0 if value > 200 else float(value)
         if -30.0 < temp_c < 120.0:
             return temp_c
-        logger.debug(f"Discarding out-of-range {name} temp from {zone_path}: {temp_c}C (raw={raw})")
+        logger.debug("Discarding out-of-range %s temp from %s: %sC (raw=%s)",
+                     name, zone_path, temp_c, raw)
     except Exception as e:
-        logger.debug(f"Could not read {name} temperature from {zone_path}: {e}")
+        logger.debug("Could not read %s temperature from %s: %s", name, zone_path, e)
     return None
 
+# Last values logged at INFO, keyed by sensor name. Periodic polls mostly
+# see an unchanged reading; demoting those to DEBUG keeps the steady-state
+# log quiet without losing the verbose trail.
+_last_logged = {'CPU': None, 'WiFi': None}
+
+def _log_temperature(name: str, temp: float):
+    """Log a reading at INFO only when it moved >= 0.5°C since last time."""
+    if temp is None:
+        logger.info("%s Temperature: unavailable", name)
+        return
+    last = _last_logged[name]
+    if last is None or abs(temp - last) >= 0.5:
+        logger.info("%s Temperature: %.1f°C", name, temp)
+        _last_logged[name] = temp
+    else:
+        logger.debug("%s Temperature: %.1f°C (unchanged)", name, temp)
+
 def log_temperatures():
     """Log CPU and WiFi temperatures."""
     cpu_temp = get_temperature("/sys/class/thermal/thermal_zone2/temp", "CPU")
     wifi_temp = get_temperature("/sys/class/thermal/thermal_zone1/temp", "WiFi")
-    
-    if cpu_temp is not None:
-        logger.info(f"CPU Temperature: {cpu_temp:.1f}°C")
-    else:
-        logger.info("CPU Temperature: unavailable")
-        
-    if wifi_temp is not None:
-        logger.info(f"WiFi Temperature: {wifi_temp:.1f}°C")
-    else:
-        logger.info("WiFi Temperature: unavailable")
\ No newline at end of file
+
+    _log_temperature("CPU", cpu_temp)
+    _log_temperature("WiFi", wifi_temp)
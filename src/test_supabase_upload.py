@@ -5,6 +5,7 @@ Run this to verify your Supabase setup is working correctly.
 
 import sys
 import os
+import time
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -12,17 +13,16 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from supabase_upload import get_supabase_client, upload_slip_data, build_qr_url
 
 def test_connection():
-    """Test basic Supabase connection."""
+    """Test basic Supabase connection and return the client for reuse."""
     print("Testing Supabase connection...")
     client = get_supabase_client()
-    
+
     if client:
         print("✓ Successfully connected to Supabase!")
-        return True
     else:
         print("✗ Failed to connect to Supabase")
         print("  Make sure SUPABASE_URL and SUPABASE_SERVICE_KEY are set in your .env file")
-        return False
+    return client
 
 
 def test_upload():
@@ -62,15 +62,10 @@ def test_upload():
         return None
 
 
-def test_read(data_id: str):
+def test_read(client, data_id: str):
     """Test reading data back from Supabase."""
     print("\nTesting data read...")
-    
-    client = get_supabase_client()
-    if not client:
-        print("✗ Could not get Supabase client")
-        return False
-    
+
     try:
         result = client.table('slips').select('*').eq('data_id', data_id).execute()
         
@@ -86,21 +81,29 @@ def test_read(data_id: str):
         return False
 
 
-def test_delete(data_id: str):
-    """Clean up test data."""
-    print("\nCleaning up test data...")
-    
-    client = get_supabase_client()
-    if not client:
-        print("✗ Could not get Supabase client")
-        return False
-    
+def test_verify_and_delete(client, data_id: str):
+    """Verify the uploaded record and clean it up in one round-trip."""
+    print("\nVerifying and cleaning up test data...")
+
     try:
-        result = client.table('slips').delete().eq('data_id', data_id).execute()
-        print(f"✓ Deleted test record with data_id: {data_id}")
-        return True
+        # delete with return=representation echoes the deleted row, so one
+        # request both proves the insert landed and removes it. Retry a few
+        # times since the upload flushes on a background thread.
+        for attempt in range(3):
+            result = (client.table('slips')
+                      .delete(returning='representation')
+                      .eq('data_id', data_id)
+                      .execute())
+            if result.data and len(result.data) > 0:
+                print("✓ Read back and deleted test record!")
+                print(f"  Retrieved record: {result.data[0]}")
+                return True
+            time.sleep(0.5 * (attempt + 1))
+
+        print("✗ No data found for data_id:", data_id)
+        return False
     except Exception as e:
-        print(f"✗ Error deleting data: {e}")
+        print(f"✗ Error verifying/deleting data: {e}")
         return False
 
 
@@ -128,21 +131,22 @@ def main():
         print("\n⚠ Please set the required environment variables and try again.")
         return
     
-    # Run tests
-    if not test_connection():
+    # Run tests, reusing the one client from the connection check
+    client = test_connection()
+    if not client:
         return
-    
+
     data_id = test_upload()
     if not data_id:
         return
-    
-    test_read(data_id)
-    
+
     # Ask before deleting
     response = input("\nDelete test record? (y/n): ").strip().lower()
     if response == 'y':
-        test_delete(data_id)
+        # One round-trip verifies the upload and cleans it up
+        test_verify_and_delete(client, data_id)
     else:
+        test_read(client, data_id)
         print(f"Test record kept. data_id: {data_id}")
     
     print("\n" + "=" * 60)